@@ -1,11 +1,11 @@
 from langchain_core.messages import HumanMessage, AnyMessage
 from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import tools_condition, ToolNode
-from pydantic import BaseModel
-from typing import Annotated, List
+from typing import Annotated, List, TypedDict
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph_mcp.checkpointing import DeltaMemorySaver
 from langgraph_mcp.configuration import get_llm
+from langgraph_mcp.visualisation import maybe_render_graph
 
 """
 LangGraph ReAct Agent with Local Tools
@@ -51,13 +51,13 @@ def divide(a: int, b: int) -> float:
 
 
 # Define the state of the graph.
-class MessageState(BaseModel):
+class MessageState(TypedDict):
     messages: Annotated[List[AnyMessage], add_messages]
 
 
 def assistant(state: MessageState):
-    state.messages = llm_with_tools.invoke(state.messages)
-    return state
+    # Return only the new message, add_messages appends it to the state
+    return {"messages": [llm_with_tools.invoke(state["messages"])]}
 
 
 def build_graph(tools):
@@ -74,14 +74,9 @@ def build_graph(tools):
     # Note: The tool call output will be sent back to the assistant node (to 'summarize' the tool call)
     builder.add_edge("tools", "assistant")
 
-    memory = MemorySaver()
+    memory = DeltaMemorySaver()
     react_graph_memory = builder.compile(checkpointer=memory)
-
-    # Visualise the graph
-    png_bytes = react_graph_memory.get_graph().draw_mermaid_png()
-    with open("src/langgraph_mcp/graph_visualisation/model_graph.png", "wb") as f:
-        f.write(png_bytes)
-        return react_graph_memory
+    return react_graph_memory
 
 
 if __name__ == "__main__":
@@ -96,6 +91,9 @@ if __name__ == "__main__":
     # build graph
     react_graph_memory = build_graph(tools=tools)
 
+    # Visualise the graph (opt-in, local): GRAPH_VISUALISATION=mermaid or png
+    maybe_render_graph(react_graph_memory)
+
     # setup config
     config = {"configurable": {"thread_id": "1"}}
 
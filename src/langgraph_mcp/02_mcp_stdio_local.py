@@ -1,13 +1,15 @@
 import asyncio
+import uuid
+from contextlib import AsyncExitStack
 from pathlib import Path
 from langchain_core.messages import HumanMessage, AnyMessage
 from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import tools_condition, ToolNode
-from pydantic import BaseModel
-from typing import Annotated, List
+from typing import Annotated, List, TypedDict
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import load_mcp_tools
+from langgraph_mcp.checkpointing import DeltaMemorySaver
 from langgraph_mcp.configuration import get_llm
 
 """
@@ -24,7 +26,7 @@ Example:
 
 
 # Define the state of the graph.
-class MessageState(BaseModel):
+class MessageState(TypedDict):
     messages: Annotated[List[AnyMessage], add_messages]
 
 
@@ -32,8 +34,8 @@ def create_assistant(llm_with_tools):
     """Create an assistant function with access to the LLM"""
 
     async def assistant(state: MessageState):
-        state.messages = await llm_with_tools.ainvoke(state.messages)
-        return state
+        # Return only the new message, add_messages appends it to the state
+        return {"messages": [await llm_with_tools.ainvoke(state["messages"])]}
 
     return assistant
 
@@ -56,30 +58,16 @@ def build_graph(tools):
     # note: The tool call output will be sent back to the assistant node (to 'summarize' the tool call)
     builder.add_edge("tools", "assistant")
 
-    memory = MemorySaver()
+    memory = DeltaMemorySaver()
     react_graph_memory = builder.compile(checkpointer=memory)
     return react_graph_memory
 
 
-async def validate_servers(all_servers):
-    """Validate and filter MCP servers, returning only successful ones"""
-    successful_servers = {}
-    for server_name, server_config in all_servers.items():
-        try:
-            test_client = MultiServerMCPClient({server_name: server_config})
-            await test_client.get_tools()
-            successful_servers[server_name] = server_config
-            print(f"Successfully loaded: {server_name}")
-        except Exception as e:
-            print(f"Failed to load {server_name}: {e}")
-    return successful_servers
-
-
-async def run_mcp_agent(input_state):
-    """Load MCP tools from multiple servers and run the LangGraph agent"""
+def get_server_configs():
+    """Return the stdio configs of the local MCP servers"""
     current_dir = Path(__file__).parent
 
-    all_servers = {
+    return {
         "math": {
             "command": "python",
             "args": [str(current_dir / "local_mcp_servers" / "math_server.py")],
@@ -92,39 +80,126 @@ async def run_mcp_agent(input_state):
         },
     }
 
-    successful_servers = await validate_servers(all_servers)
 
-    if successful_servers:
-        client = MultiServerMCPClient(successful_servers)
-        tools = await client.get_tools()
+class AgentRuntime:
+    """
+    Long-lived agent runtime: starts the MCP servers, loads their tools and compiles
+    the graph once, then serves many questions (each on its own thread_id).
+    The compiled graph, the open MCP sessions (one server process each) and the
+    checkpointer are shared by all runs. Call aclose() to stop the servers.
+    """
 
-        print(
-            f"Loaded {len(tools)} MCP tools from {len(successful_servers)} server(s):"
-        )
-        for tool in tools:
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max_concurrency
+        self.client = None
+        self.sessions = AsyncExitStack()
+        self.tools = []
+        self.graph = None
+
+    async def start(self):
+        """Start the servers, load tools and compile the graph (once)"""
+        try:
+            return await self._start()
+        except BaseException:
+            # Don't leak the server processes that did start
+            await self.aclose()
+            raise
+
+    async def _start(self):
+        all_servers = get_server_configs()
+        self.client = MultiServerMCPClient(all_servers)
+
+        # Keep one session per server open, so tool calls don't spawn a new process
+        loaded_servers = 0
+        for server_name in all_servers:
+            try:
+                session = await self.sessions.enter_async_context(
+                    self.client.session(server_name)
+                )
+                self.tools.extend(await load_mcp_tools(session))
+                loaded_servers += 1
+                print(f"Successfully loaded: {server_name}")
+            except Exception as e:
+                print(f"Failed to load {server_name}: {e}")
+
+        if not loaded_servers:
+            print("No servers loaded! Terminating.")
+            raise RuntimeError("No MCP servers available")
+
+        print(f"Loaded {len(self.tools)} MCP tools from {loaded_servers} server(s):")
+        for tool in self.tools:
             print(f"  - {tool.name}: {tool.description}")
-    else:
-        print("No servers loaded! Terminating.")
-        raise RuntimeError("No MCP servers available")
 
-    graph = build_graph(tools)
-    config = {"configurable": {"thread_id": "1"}}
+        self.graph = build_graph(self.tools)
+        return self
 
-    # Test with math question
-    result = await graph.ainvoke(input_state, config)
+    @property
+    def checkpointer(self):
+        return self.graph.checkpointer
 
-    return result
+    async def ask(self, input_state, thread_id: str = None):
+        """Run one input through the compiled graph on its own thread"""
+        if self.graph is None:
+            raise RuntimeError("AgentRuntime is not started, call start() first")
 
+        config = {"configurable": {"thread_id": thread_id or str(uuid.uuid4())}}
+        return await self.graph.ainvoke(input_state, config)
 
-if __name__ == "__main__":
-    input_state = {"messages": [HumanMessage(content="What's (3 + 5) * 12?")]}
-    result = asyncio.run(run_mcp_agent(input_state))
-    for m in result["messages"]:
-        m.pretty_print()
+    async def batch(self, inputs, thread_ids: list[str] = None):
+        """Run a list of inputs concurrently, at most max_concurrency at a time"""
+        thread_ids = thread_ids or [str(uuid.uuid4()) for _ in inputs]
+        if len(thread_ids) != len(inputs):
+            raise ValueError(
+                f"Got {len(inputs)} inputs but {len(thread_ids)} thread_ids"
+            )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-    input_state = {
-        "messages": [HumanMessage(content="What's the weather forecast in london?")]
-    }
-    result = asyncio.run(run_mcp_agent(input_state))
-    for m in result["messages"]:
-        m.pretty_print()
+        async def run_one(input_state, thread_id):
+            async with semaphore:
+                return await self.ask(input_state, thread_id)
+
+        return await asyncio.gather(
+            *(run_one(i, t) for i, t in zip(inputs, thread_ids))
+        )
+
+    async def aclose(self):
+        """Close the MCP sessions (stops the server processes)"""
+        await self.sessions.aclose()
+
+
+async def run_mcp_agent(
+    input_state, runtime: AgentRuntime = None, thread_id: str = None
+):
+    """
+    Load MCP tools from multiple servers and run the LangGraph agent.
+    Each call runs on a new thread unless thread_id is given (to continue a conversation).
+    """
+    # Reuse a running runtime when given, otherwise start (and stop) a one-off runtime
+    if runtime is not None:
+        return await runtime.ask(input_state, thread_id)
+
+    runtime = await AgentRuntime().start()
+    try:
+        return await runtime.ask(input_state, thread_id)
+    finally:
+        await runtime.aclose()
+
+
+async def main():
+    inputs = [
+        {"messages": [HumanMessage(content="What's (3 + 5) * 12?")]},
+        {"messages": [HumanMessage(content="What's the weather forecast in london?")]},
+    ]
+
+    runtime = await AgentRuntime().start()
+    try:
+        results = await runtime.batch(inputs)
+        for result in results:
+            for m in result["messages"]:
+                m.pretty_print()
+    finally:
+        await runtime.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
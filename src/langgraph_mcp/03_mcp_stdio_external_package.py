@@ -1,22 +1,25 @@
 from fastapi import FastAPI, Form, Request
 from fastapi.responses import RedirectResponse
-from fastapi.staticfiles import StaticFiles
 import os
 from contextlib import asynccontextmanager
 from langchain_core.messages import SystemMessage
+from langchain_core.runnables import RunnableConfig
 from pathlib import Path
 from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import tools_condition, ToolNode
-from pydantic import BaseModel
-from typing import Annotated, List
+from typing import Annotated, List, NotRequired, TypedDict
 from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langgraph_mcp import build_static
+from langgraph_mcp.compaction import ConversationCompactor
+from langgraph_mcp.checkpointing import DeltaMemorySaver
+from langgraph_mcp.compression import PrecompressedStaticFiles
 from langgraph_mcp.configuration import get_llm
-from langgraph_mcp.streaming_utils import (
-    chat_endpoint_handler,
-    truncate_messages_safely,
-)
+from langgraph_mcp.mcp_health import MCPHealthMonitor
+from langgraph_mcp.routing import route_stats
+from langgraph_mcp.scheduling import ChatScheduler, ThreadRuns
+from langgraph_mcp.speculation import SpeculativeToolExecutor
+from langgraph_mcp.streaming_utils import chat_endpoint_handler
+from langgraph_mcp.tool_catalog import load_catalog_tools
 
 """
 LangGraph Agent with External MCP Packages (stdio)
@@ -38,11 +41,14 @@ VERBOSE = True
 
 
 # Define the state of the graph
-class MessageState(BaseModel):
+class MessageState(TypedDict):
     messages: Annotated[List, add_messages]
+    # Rolling summary of the messages[:summarized_count] that left the prompt window
+    summary: NotRequired[str]
+    summarized_count: NotRequired[int]
 
 
-def create_assistant(llm_with_tools):
+def create_assistant(llm_with_tools, compactor: ConversationCompactor):
     """Create an assistant function with access to the LLM"""
     system_prompt = SystemMessage(
         content="""
@@ -98,47 +104,48 @@ You are an Expert Developer Relations Engineer automating technical content crea
     )
 
 
-    async def assistant(state: MessageState):
-        # Increase max_history to prevent state loss in multi-step workflows
-        messages = truncate_messages_safely(state.messages, max_history=40)
-        messages = [system_prompt] + messages
+    async def assistant(state: MessageState, config: RunnableConfig):
+        thread_id = config["configurable"]["thread_id"]
+
+        # Pick up a summary that was finished in the background since the last turn
+        update = compactor.collect(thread_id)
+        summary = update.get("summary", state.get("summary", ""))
+        summarized_count = update.get(
+            "summarized_count", state.get("summarized_count", 0)
+        )
+
+        # Constant prompt size: system prompt + rolling summary + last 40 messages
+        messages = compactor.build_prompt(system_prompt, state["messages"], summary)
         response = await llm_with_tools.ainvoke(messages)
-        return {"messages": [response]}
+
+        # Summarize history that fell out of the window, off the critical path
+        compactor.schedule(
+            thread_id, state["messages"] + [response], summary, summarized_count
+        )
+        return {"messages": [response], **update}
 
     return assistant
 
 
 def build_graph(tools):
     """Build and return the LangGraph ReAct agent with MCP tools"""
-    llm = get_llm("openai")
+    llm = get_llm(os.getenv("LLM_TYPE", "openai"))
     llm_with_tools = llm.bind_tools(tools)
 
+    compactor = ConversationCompactor(llm, max_history=40)
+
     builder = StateGraph(MessageState)
-    builder.add_node("assistant", create_assistant(llm_with_tools))
+    builder.add_node("assistant", create_assistant(llm_with_tools, compactor))
     builder.add_node("tools", ToolNode(tools))
 
     builder.add_edge(START, "assistant")
     builder.add_conditional_edges("assistant", tools_condition)
     builder.add_edge("tools", "assistant")
 
-    memory = MemorySaver()
+    memory = DeltaMemorySaver()
     return builder.compile(checkpointer=memory)
 
 
-async def validate_servers(all_servers):
-    """Validate and filter MCP servers, returning only successful ones"""
-    successful_servers = {}
-    for server_name, server_config in all_servers.items():
-        try:
-            test_client = MultiServerMCPClient({server_name: server_config})
-            await test_client.get_tools()
-            successful_servers[server_name] = server_config
-            print(f"Successfully loaded: {server_name}")
-        except Exception as e:
-            print(f"Failed to load {server_name}: {e}")
-    return successful_servers
-
-
 async def setup_langgraph_app():
     """Setup the LangGraph app with MCP tools"""
     current_dir = Path(__file__).parent
@@ -152,6 +159,11 @@ async def setup_langgraph_app():
             "args": [str(current_dir / "local_mcp_servers" / "math_server.py")],
             "transport": "stdio",
         },
+        "local_weather": {
+            "command": "python",
+            "args": [str(current_dir / "local_mcp_servers" / "weather_server.py")],
+            "transport": "stdio",
+        },
     
         # External MCP package (installed via uv/npx)
     
@@ -189,18 +201,22 @@ async def setup_langgraph_app():
     
     }
 
-    # Validate servers - only load ones that work
-    successful_servers = await validate_servers(all_servers)
+    # Load tool schemas from the local catalog (servers spawn lazily / warm in the
+    # background); servers missing from the catalog are spawned now, failing ones skipped
+    tools, servers = await load_catalog_tools(all_servers)
 
-    if successful_servers:
-        client = MultiServerMCPClient(successful_servers)
-        tools = await client.get_tools()
-
-        print(f"\nLoaded {len(tools)} tools from {len(successful_servers)} server(s):")
+    if servers:
+        print(f"\nLoaded {len(tools)} tools from {len(servers)} server(s):")
         for tool in tools:
             print(f"  - {tool.name}: {tool.description}")
 
-        return build_graph(tools)
+        # Fail fast on hanging or dead servers (circuit breaker per server)
+        health_monitor = MCPHealthMonitor.from_env(servers)
+        health_monitor.wrap_tools(tools)
+
+        # Read-only tools may start while the model is still streaming their arguments
+        speculator = SpeculativeToolExecutor(tools)
+        return build_graph(tools), speculator, health_monitor
     else:
         print("No servers loaded! Terminating.")
         raise RuntimeError("No MCP servers available")
@@ -208,15 +224,36 @@ async def setup_langgraph_app():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    app.state.langgraph_app = await setup_langgraph_app()
+    (
+        app.state.langgraph_app,
+        app.state.tool_speculator,
+        app.state.mcp_health,
+    ) = await setup_langgraph_app()
+    app.state.mcp_health.start()
+    # Limit concurrent graph runs (CHAT_MAX_CONCURRENCY, CHAT_MAX_QUEUE, ...)
+    app.state.chat_scheduler = ChatScheduler.from_env()
+    # One graph run at a time per thread_id, duplicate submits share the run
+    app.state.thread_runs = ThreadRuns()
     yield
+    await app.state.mcp_health.stop()
+    for server in app.state.mcp_health.servers.values():
+        await server.close()
 
 
 app = FastAPI(lifespan=lifespan)
 
-# Mount static files directory
-static_dir = os.path.join(os.path.dirname(__file__), "..", "static")
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+# Mount static files directory (the precompressed, content-hashed build with
+# STATIC_BUILD=true, see build_static.py)
+static_dir = build_static.STATIC_DIR
+if os.getenv("STATIC_BUILD", "false").lower() == "true":
+    if build_static.is_stale():
+        print(
+            "Warning: src/static_build is missing or older than src/static, "
+            "run build_static.py (serving src/static meanwhile)"
+        )
+    else:
+        static_dir = build_static.BUILD_DIR
+app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
 
 
 @app.get("/")
@@ -232,6 +269,22 @@ async def chat_endpoint(
     return await chat_endpoint_handler(request, user_input, thread_id, VERBOSE)
 
 
+@app.get("/chat/metrics")
+def chat_metrics(request: Request):
+    return request.app.state.chat_scheduler.metrics()
+
+
+@app.get("/mcp/health")
+def mcp_health(request: Request):
+    return request.app.state.mcp_health.summary()
+
+
+@app.get("/llm/metrics")
+def llm_metrics():
+    # Per-route latency when LLM_TYPE=routed
+    return route_stats.summary()
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,113 @@
+"""
+Build step for the chat frontend: content-hashed filenames + precompressed assets
+
+  poetry run python src/langgraph_mcp/build_static.py
+
+Reads src/static and writes src/static_build:
+- every asset except chat.html gets a content hash in its name (chat.3f2a9c1b.js),
+  and references in chat.html / CSS / JS are rewritten to the hashed names
+- text assets get a .gz (and a .br when the brotli package is installed) next to them
+- manifest.json maps original to hashed names (used for immutable cache headers)
+
+03_mcp_stdio_external_package.py serves src/static_build instead of src/static when
+STATIC_BUILD=true (and warns when the build is older than the sources).
+"""
+
+import gzip
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+BUILD_DIR = Path(__file__).parent.parent / "static_build"
+
+ENTRY_POINTS = {"chat.html"}
+# Assets that may reference other assets (rewritten before hashing)
+REFERENCING_SUFFIXES = {".html", ".css", ".js"}
+COMPRESSIBLE_SUFFIXES = {".html", ".css", ".js", ".svg", ".json"}
+
+
+def hashed_name(relative: str, content: bytes) -> str:
+    path = Path(relative)
+    digest = hashlib.sha256(content).hexdigest()[:8]
+    return str(path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix())
+
+
+def rewrite_references(text: str, manifest: dict[str, str]) -> str:
+    # Longest names first, so "img/Logo.svg" is not partially replaced by a shorter name
+    for original in sorted(manifest, key=len, reverse=True):
+        for quote in ('"', "'", "("):
+            closing = ")" if quote == "(" else quote
+            text = text.replace(
+                f"{quote}{original}{closing}", f"{quote}{manifest[original]}{closing}"
+            )
+    return text
+
+
+def compress(path: Path):
+    data = path.read_bytes()
+    # mtime=0 keeps the output (and its ETag) reproducible
+    Path(f"{path}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    try:
+        import brotli
+
+        Path(f"{path}.br").write_bytes(brotli.compress(data, quality=11))
+    except ImportError:
+        pass
+
+
+def is_stale() -> bool:
+    """True when the build is missing or a source file changed after the last build"""
+    manifest = BUILD_DIR / "manifest.json"
+    if not manifest.exists():
+        return True
+    built_at = manifest.stat().st_mtime
+    return any(
+        path.stat().st_mtime > built_at
+        for path in STATIC_DIR.rglob("*")
+        if path.is_file()
+    )
+
+
+def build():
+    if BUILD_DIR.exists():
+        shutil.rmtree(BUILD_DIR)
+
+    files = sorted(
+        path.relative_to(STATIC_DIR).as_posix()
+        for path in STATIC_DIR.rglob("*")
+        if path.is_file()
+    )
+    # Plain assets first, then the ones that reference them, entry points last
+    files.sort(
+        key=lambda f: (f in ENTRY_POINTS, Path(f).suffix in REFERENCING_SUFFIXES)
+    )
+
+    manifest = {}
+    for relative in files:
+        content = (STATIC_DIR / relative).read_bytes()
+        if Path(relative).suffix in REFERENCING_SUFFIXES:
+            content = rewrite_references(content.decode("utf-8"), manifest).encode(
+                "utf-8"
+            )
+
+        output = (
+            relative if relative in ENTRY_POINTS else hashed_name(relative, content)
+        )
+        if relative not in ENTRY_POINTS:
+            manifest[relative] = output
+
+        target = BUILD_DIR / output
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        if target.suffix in COMPRESSIBLE_SUFFIXES:
+            compress(target)
+        print(f"  {relative} -> {output}")
+
+    (BUILD_DIR / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    print(f"Built {len(files)} assets into {BUILD_DIR}")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,80 @@
+"""
+Microbenchmark: per-step checkpoint cost as the conversation grows
+
+Compares MemorySaver (full message list per step) with DeltaMemorySaver (new messages
+only) on a graph without LLM calls, so only state handling and checkpointing are measured.
+
+Run: poetry run python src/langgraph_mcp/checkpoint_benchmark.py
+"""
+
+import time
+from typing import Annotated, List, TypedDict
+
+from langchain_core.messages import AIMessage, AnyMessage, HumanMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph_mcp.checkpointing import DeltaMemorySaver
+
+HISTORY_SIZES = [10, 100, 500, 1000, 2000]
+STEPS_PER_RUN = 10
+RUNS_PER_SIZE = 5
+
+
+class MessageState(TypedDict):
+    messages: Annotated[List[AnyMessage], add_messages]
+    steps: int
+
+
+def echo(state: MessageState):
+    # Like an assistant/tools loop: one new message per step
+    return {"messages": [AIMessage(content="ok " * 50)], "steps": state["steps"] - 1}
+
+
+def build_graph(checkpointer):
+    builder = StateGraph(MessageState)
+    builder.add_node("echo", echo)
+    builder.add_edge(START, "echo")
+    builder.add_conditional_edges(
+        "echo", lambda state: "echo" if state["steps"] > 0 else END
+    )
+    return builder.compile(checkpointer=checkpointer)
+
+
+def run(graph, config, steps: int):
+    message = HumanMessage(content="question " * 50)
+    graph.invoke({"messages": [message], "steps": steps}, config)
+
+
+def measure(checkpointer) -> dict[int, float]:
+    """Grow one thread to each history size and time the next runs (ms per step)"""
+    graph = build_graph(checkpointer)
+    config = {"configurable": {"thread_id": "benchmark"}}
+    results = {}
+    length = 0
+
+    for size in HISTORY_SIZES:
+        # Grow the history (one run adds a HumanMessage + STEPS_PER_RUN AIMessages)
+        while length < size:
+            run(graph, config, STEPS_PER_RUN)
+            length += STEPS_PER_RUN + 1
+
+        start = time.perf_counter()
+        for _ in range(RUNS_PER_SIZE):
+            run(graph, config, STEPS_PER_RUN)
+        elapsed = time.perf_counter() - start
+        results[size] = elapsed / (RUNS_PER_SIZE * STEPS_PER_RUN) * 1000
+        length += RUNS_PER_SIZE * (STEPS_PER_RUN + 1)
+
+    return results
+
+
+if __name__ == "__main__":
+    full = measure(MemorySaver())
+    delta = measure(DeltaMemorySaver())
+
+    print(
+        f"{'history':>8} {'MemorySaver ms/step':>20} {'DeltaMemorySaver ms/step':>25}"
+    )
+    for size in HISTORY_SIZES:
+        print(f"{size:>8} {full[size]:>20.2f} {delta[size]:>25.2f}")
@@ -0,0 +1,132 @@
+"""Append-only delta checkpoints for message lists"""
+
+from operator import is_
+
+from langgraph.checkpoint.memory import MemorySaver
+
+
+class DeltaMemorySaver(MemorySaver):
+    """
+    MemorySaver that stores only the new messages per step.
+
+    MemorySaver serializes the full value of every changed channel on every step, so
+    the cost of a step grows with the length of the conversation. For append-only
+    channels (the messages list) this saver stores just the appended messages plus a
+    pointer to the previous version:
+
+    - A full snapshot is written once the messages stored as deltas outnumber the
+      last snapshot (and at least min_delta_messages were appended), or whenever
+      the list was not simply appended to. Snapshot cost is then amortized to a
+      constant per appended message, and a rebuild reads at most twice the list.
+    - Loading the latest version of a thread reuses the list kept from the last
+      put/load instead of deserializing the chain. Only older versions (history,
+      time travel) or a cold saver rebuild from the snapshot and its deltas.
+
+    This does not make a step flat: the add_messages reducer copies and re-indexes
+    the whole message list on every step, and the append check compares every
+    message by identity, so a step still costs O(n) in the history length
+    (checkpoint_benchmark.py measured about 1.5 ms/step at 10 messages and
+    15 ms/step at 2000 before the snapshot and load changes above).
+
+    Loaded message objects are shared with that cache: don't mutate them in place.
+    """
+
+    def __init__(
+        self, *, delta_channels=("messages",), min_delta_messages: int = 50, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.delta_channels = set(delta_channels)
+        self.min_delta_messages = min_delta_messages
+        # (thread_id, ns, channel, version) -> (base_version, serialized new messages)
+        self.deltas: dict[tuple, tuple] = {}
+        # (thread_id, ns, channel) -> (version, list value, length of last snapshot)
+        self.last_put: dict[tuple, tuple] = {}
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values = checkpoint["channel_values"]
+
+        full_versions = {}
+        for channel, version in new_versions.items():
+            value = values.get(channel)
+            if channel not in self.delta_channels or not isinstance(value, list):
+                full_versions[channel] = version
+                continue
+
+            key = (thread_id, checkpoint_ns, channel)
+            previous = self.last_put.get(key)
+            if (
+                previous
+                and self._chain_fits(previous[2], len(value))
+                and _is_append(previous[1], value)
+            ):
+                base_version, base_value, snapshot_length = previous
+                self.deltas[(*key, version)] = (
+                    base_version,
+                    self.serde.dumps_typed(value[len(base_value) :]),
+                )
+                self.blobs[(*key, version)] = ("delta", b"")
+                self.last_put[key] = (version, value, snapshot_length)
+            else:
+                full_versions[channel] = version
+                self.last_put[key] = (version, value, len(value))
+
+        return super().put(config, checkpoint, metadata, full_versions)
+
+    def _load_blobs(self, thread_id, checkpoint_ns, versions):
+        channel_values = {}
+        for channel, version in versions.items():
+            key = (thread_id, checkpoint_ns, channel, version)
+            last = self.last_put.get(key[:3])
+            if last and last[0] == version:
+                # Latest version: the list is already in memory
+                channel_values[channel] = list(last[1])
+                continue
+
+            if key in self.deltas:
+                value = self._rebuild(*key)
+            elif key in self.blobs and self.blobs[key][0] != "empty":
+                value = self.serde.loads_typed(self.blobs[key])
+            else:
+                continue
+            channel_values[channel] = value
+
+            # A cold saver (e.g. after a restart) learns the latest value on first load,
+            # so the next step on this thread can be stored as a delta as well
+            if channel in self.delta_channels and key[:3] not in self.last_put:
+                if isinstance(value, list):
+                    self.last_put[key[:3]] = (version, value, len(value))
+        return channel_values
+
+    def _chain_fits(self, snapshot_length: int, length: int) -> bool:
+        """Deltas since the last snapshot may grow up to the snapshot's own size"""
+        return length - snapshot_length < max(snapshot_length, self.min_delta_messages)
+
+    def _rebuild(self, thread_id, checkpoint_ns, channel, version) -> list:
+        """Walk back to the last full snapshot, then re-apply the deltas"""
+        chain = []
+        while (thread_id, checkpoint_ns, channel, version) in self.deltas:
+            version, delta = self.deltas[(thread_id, checkpoint_ns, channel, version)]
+            chain.append(delta)
+
+        value = list(
+            self.serde.loads_typed(
+                self.blobs[(thread_id, checkpoint_ns, channel, version)]
+            )
+        )
+        for delta in reversed(chain):
+            value.extend(self.serde.loads_typed(delta))
+        return value
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        for key in [key for key in self.deltas if key[0] == thread_id]:
+            del self.deltas[key]
+        for key in [key for key in self.last_put if key[0] == thread_id]:
+            del self.last_put[key]
+
+
+def _is_append(old: list, new: list) -> bool:
+    """True when new is old plus appended items (add_messages keeps the same objects)"""
+    return len(new) >= len(old) and all(map(is_, old, new))
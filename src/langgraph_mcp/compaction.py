@@ -0,0 +1,112 @@
+"""Rolling conversation compaction: summarize history that falls out of the prompt window"""
+
+import asyncio
+from langchain_core.messages import (
+    AIMessage,
+    AnyMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langgraph_mcp.streaming_utils import truncate_messages_safely
+from langgraph_mcp.utils import SILENT
+
+SUMMARY_INSTRUCTIONS = """
+You maintain a rolling summary of a conversation between a user and an AI agent that uses tools.
+Update the existing summary with the new messages. Keep facts the agent may need later:
+the user's goals, decisions, file paths, tool results (key values only) and open tasks.
+Be concise, max 300 words. Return only the updated summary.
+"""
+
+
+class ConversationCompactor:
+    """
+    Keeps the per-turn prompt at a fixed size without forgetting older context.
+
+    Messages that fall out of the history window are folded into a rolling summary by a
+    background task. The next assistant turn picks up the finished summary and stores it
+    in graph state (summary, summarized_count), so the summarizer never runs on the
+    critical path of a turn.
+    """
+
+    def __init__(self, llm, max_history: int = 40, min_batch: int = 8):
+        self.llm = llm
+        self.max_history = max_history
+        self.min_batch = min_batch
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.ready: dict[str, tuple[str, int]] = {}
+
+    def build_prompt(self, system_prompt, messages, summary: str):
+        """System prompt + rolling summary + the last max_history messages"""
+        window = truncate_messages_safely(messages, max_history=self.max_history)
+        prompt = [system_prompt]
+        if summary:
+            prompt.append(
+                SystemMessage(
+                    content=f"Summary of the earlier conversation:\n{summary}"
+                )
+            )
+        return prompt + window
+
+    def collect(self, thread_id: str) -> dict:
+        """State update with a summary finished in the background (or {})"""
+        if thread_id not in self.ready:
+            return {}
+        summary, summarized_count = self.ready.pop(thread_id)
+        return {"summary": summary, "summarized_count": summarized_count}
+
+    def schedule(
+        self,
+        thread_id: str,
+        messages: list[AnyMessage],
+        summary: str,
+        summarized_count: int,
+    ):
+        """Start summarizing messages that left the window (no-op if too few or busy)"""
+        if thread_id in self.tasks or thread_id in self.ready:
+            return
+
+        messages = [msg for msg in messages if not isinstance(msg, SystemMessage)]
+        window = truncate_messages_safely(messages, max_history=self.max_history)
+        window_start = len(messages) - len(window)
+        if window_start - summarized_count < self.min_batch:
+            return
+
+        dropped = messages[summarized_count:window_start]
+        task = asyncio.create_task(self._summarize(summary, dropped))
+        self.tasks[thread_id] = task
+
+        def done(task):
+            del self.tasks[thread_id]
+            if not task.cancelled() and task.exception() is None:
+                self.ready[thread_id] = (task.result(), window_start)
+            elif not task.cancelled():
+                print(f"Conversation compaction failed: {task.exception()}")
+
+        task.add_done_callback(done)
+
+    async def _summarize(self, summary: str, dropped: list[AnyMessage]) -> str:
+        transcript = "\n".join(_format_message(msg) for msg in dropped)
+        response = await self.llm.ainvoke(
+            [
+                SystemMessage(content=SUMMARY_INSTRUCTIONS),
+                HumanMessage(
+                    content=f"Existing summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"
+                ),
+            ],
+            config=SILENT,
+        )
+        return str(response.content).strip()
+
+
+def _format_message(msg: AnyMessage, max_chars: int = 2000) -> str:
+    """One transcript line per message (long tool output is cut off)"""
+    content = " ".join(str(msg.content).split())[:max_chars]
+    if isinstance(msg, AIMessage) and msg.tool_calls:
+        calls = ", ".join(f"{call['name']}({call['args']})" for call in msg.tool_calls)
+        return f"Assistant called tools: {calls} {content}".strip()
+    if isinstance(msg, ToolMessage):
+        return f"Tool {msg.name or ''} returned: {content}"
+    if isinstance(msg, HumanMessage):
+        return f"User: {content}"
+    return f"Assistant: {content}"
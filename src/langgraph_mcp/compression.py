@@ -0,0 +1,81 @@
+"""Precompressed, cache-validated static files and per-event compressed chat streams"""
+
+import json
+import mimetypes
+import os
+import zlib
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.staticfiles import StaticFiles
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Gzip the /chat stream when the client accepts it (CHAT_STREAM_COMPRESSION=true)
+CHAT_STREAM_COMPRESSION = (
+    os.getenv("CHAT_STREAM_COMPRESSION", "false").lower() == "true"
+)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the .br / .gz files written by build_static.py when the
+    client accepts them, marks content-hashed files (listed in manifest.json) as
+    immutable and lets everything else revalidate with its ETag (304 Not Modified).
+    """
+
+    def __init__(self, *, directory, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        try:
+            manifest = json.loads((Path(directory) / "manifest.json").read_text())
+            self.hashed_files = set(manifest.values())
+        except (OSError, ValueError):
+            self.hashed_files = set()
+
+    async def get_response(self, path: str, scope):
+        accepted = Headers(scope=scope).get("accept-encoding", "")
+        response = None
+
+        if path and not path.endswith("/"):
+            for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = self.lookup_path(path + suffix)
+                if stat_result is not None:
+                    # ETag/Last-Modified of the compressed file, 304 handled as usual
+                    response = self.file_response(full_path, stat_result, scope)
+                    response.headers["content-encoding"] = encoding
+                    if response.status_code == 200:
+                        media_type = mimetypes.guess_type(path)[0] or "text/plain"
+                        response.headers["content-type"] = media_type
+                    break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers["vary"] = "Accept-Encoding"
+        if response.status_code in (200, 304):
+            response.headers["cache-control"] = (
+                IMMUTABLE if path in self.hashed_files else REVALIDATE
+            )
+        return response
+
+
+def accepts_gzip(headers) -> bool:
+    return "gzip" in headers.get("accept-encoding", "")
+
+
+async def gzip_stream(stream):
+    """
+    Gzip an event stream, flushing after every event (Z_SYNC_FLUSH) so each token
+    reaches the client immediately instead of waiting for the compressor's buffer.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    try:
+        async for chunk in stream:
+            data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+    finally:
+        await stream.aclose()
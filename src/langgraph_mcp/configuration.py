@@ -2,6 +2,7 @@ from langchain_ollama import ChatOllama
 from langchain_openai import AzureChatOpenAI
 import os
 from dotenv import load_dotenv
+from langgraph_mcp.routing import RoutingLLM
 
 # Load environment variables from .env file
 load_dotenv()
@@ -10,8 +11,15 @@ load_dotenv()
 def get_llm(llm_type="openai"):
     """
     Returns an LLM instance.
-    llm_type: "qwen" (default) or "openai"
+    llm_type: "qwen" (default), "openai" or "routed"
+    "routed" picks tools with local qwen and answers with Azure OpenAI (hedged on latency)
     """
+    if llm_type == "routed":
+        return RoutingLLM(
+            local=get_llm("qwen"),
+            remote=get_llm("openai"),
+            hedge_after=float(os.getenv("LLM_HEDGE_AFTER", 5.0)),
+        )
     if llm_type == "openai":
         api_key = os.getenv("AZURE_OPENAI_API_KEY")
         endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
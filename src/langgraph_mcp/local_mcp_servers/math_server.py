@@ -1,3 +1,8 @@
+import ast
+import math
+import operator
+
+import numpy as np
 from mcp.server.fastmcp import FastMCP
 
 mcp = FastMCP("Math")
@@ -21,5 +26,107 @@ def divide(a: float, b: float) -> float:
     return a / b
 
 
+@mcp.tool()
+def batch_add(pairs: list[list[float]]) -> list[float]:
+    """Add many pairs of numbers in one call, e.g. [[1, 2], [3, 4]] -> [3, 7]"""
+    a, b = _split_pairs(pairs)
+    return np.add(a, b).tolist()
+
+
+@mcp.tool()
+def batch_multiply(pairs: list[list[float]]) -> list[float]:
+    """Multiply many pairs of numbers in one call, e.g. [[2, 3], [4, 5]] -> [6, 20]"""
+    a, b = _split_pairs(pairs)
+    return np.multiply(a, b).tolist()
+
+
+@mcp.tool()
+def batch_divide(pairs: list[list[float]]) -> list[float | None]:
+    """Divide many pairs of numbers in one call. Division by zero gives null."""
+    a, b = _split_pairs(pairs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.divide(a, b)
+    return [None if not np.isfinite(x) else float(x) for x in result]
+
+
+@mcp.tool()
+def evaluate(expression: str) -> int | float:
+    """
+    Evaluate a whole arithmetic expression in one call, e.g. "(3 + 5) * 12".
+    Supports numbers, parentheses and + - * / // % ** operators.
+    Integer results are exact (up to MAX_RESULT_DIGITS digits).
+    """
+    tree = ast.parse(expression, mode="eval")
+    return _eval_node(tree.body)
+
+
+# Helper functions
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# Guard against expressions like 9 ** 9 ** 9 or ((9 ** 999) ** 999) ** 99 that would
+# hang the server: bound both the exponent and the size of every intermediate result
+MAX_EXPONENT = 1000
+MAX_RESULT_DIGITS = 1000
+_MAX_RESULT_BITS = int(MAX_RESULT_DIGITS * math.log2(10)) + 1
+
+
+def _split_pairs(pairs: list[list[float]]) -> tuple[np.ndarray, np.ndarray]:
+    """Turn [[a1, b1], [a2, b2], ...] into two operand arrays"""
+    if len(pairs) == 0:
+        return np.empty(0), np.empty(0)
+    array = np.asarray(pairs, dtype=float)
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise ValueError("pairs must be a list of [a, b] operand pairs")
+    return array[:, 0], array[:, 1]
+
+
+def _check_power(base: float, exponent: float) -> None:
+    """Reject powers whose exponent or result would be too large to compute quickly"""
+    if abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent {exponent} is too large")
+    if abs(base) > 1 and abs(exponent) * math.log10(abs(base)) > MAX_RESULT_DIGITS:
+        raise ValueError(f"Result of power has more than {MAX_RESULT_DIGITS} digits")
+
+
+def _check_result(value: float) -> float:
+    """Keep intermediate results real and of bounded size"""
+    if isinstance(value, complex):
+        raise ValueError("Expression has a complex result")
+    if isinstance(value, int) and value.bit_length() > _MAX_RESULT_BITS:
+        raise ValueError(f"Result has more than {MAX_RESULT_DIGITS} digits")
+    return value
+
+
+def _eval_node(node: ast.AST) -> float:
+    """Recursively evaluate a whitelisted arithmetic AST node"""
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        left = _eval_node(node.left)
+        right = _eval_node(node.right)
+        if isinstance(node.op, ast.Pow):
+            _check_power(left, right)
+        return _check_result(_BINARY_OPERATORS[type(node.op)](left, right))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        return _check_result(_UNARY_OPERATORS[type(node.op)](_eval_node(node.operand)))
+
+    raise ValueError(f"Unsupported expression element: {ast.dump(node)}")
+
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
@@ -0,0 +1,35 @@
+"""Helpers for FastMCP tools that report partial results as progress notifications"""
+
+import asyncio
+from typing import Awaitable, Callable
+
+from mcp.server.fastmcp import Context
+
+
+async def gather_with_progress(
+    ctx: Context, labels: list[str], lookup: Callable[[str], Awaitable[str]]
+) -> dict[str, str]:
+    """
+    Run lookup(label) for every distinct label concurrently and report each result as
+    soon as it is ready ("label: result" as the progress message), so the client can
+    show the first results while the rest is still loading. Duplicate labels are looked
+    up once. When a lookup fails, the others are cancelled and the error is raised.
+    Returns {label: result} in the original order.
+    """
+
+    async def labeled_result(label):
+        return label, await lookup(label)
+
+    labels = list(dict.fromkeys(labels))
+    tasks = [asyncio.create_task(labeled_result(label)) for label in labels]
+    results = {}
+    try:
+        for done in asyncio.as_completed(tasks):
+            label, result = await done
+            results[label] = result
+            await ctx.report_progress(len(results), len(labels), f"{label}: {result}")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    return {label: results[label] for label in labels}
@@ -1,25 +1,40 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+from progress import gather_with_progress
+from weather_upstream import create_upstream
 
 mcp = FastMCP("Weather")
 
+# Cached upstream layer (mock data by default, HTTP source via WEATHER_SOURCE_URL)
+upstream = create_upstream()
+
 
 @mcp.tool()
-def get_weather(city: str) -> str:
+async def get_weather(city: str) -> str:
     """Get current weather for a city"""
-    # Mock weather data - in real implementation, you'd call a weather API
-    weather_data = {
-        "nyc": "Sunny, 72°F",
-        "london": "Cloudy, 65°F",
-        "tokyo": "Rainy, 68°F",
-        "paris": "Partly cloudy, 70°F",
-    }
-    return weather_data.get(city.lower(), f"Weather data not available for {city}")
+    return await upstream.current(city)
 
 
 @mcp.tool()
-def get_forecast(city: str, days: int = 3) -> str:
+async def get_forecast(city: str, days: int = 3) -> str:
     """Get weather forecast for a city"""
-    return f"Forecast for {city}: Sunny for the next {days} days"
+    return await upstream.forecast(city, days)
+
+
+@mcp.tool()
+async def get_weather_batch(cities: list[str], ctx: Context) -> dict[str, str]:
+    """Get current weather for several cities in one call (e.g. to compare cities)"""
+    # Each city is reported as progress as soon as it is available
+    return await gather_with_progress(ctx, cities, upstream.current)
+
+
+@mcp.tool()
+async def get_forecast_batch(
+    cities: list[str], ctx: Context, days: int = 3
+) -> dict[str, str]:
+    """Get weather forecasts for several cities in one call"""
+    return await gather_with_progress(
+        ctx, cities, lambda city: upstream.forecast(city, days)
+    )
 
 
 if __name__ == "__main__":
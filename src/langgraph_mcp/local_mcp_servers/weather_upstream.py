@@ -0,0 +1,191 @@
+"""
+Async upstream layer for the weather MCP server
+
+- Pluggable data source: the mock dict (default) or an HTTP backend (WEATHER_SOURCE_URL)
+- Per-city TTL cache, so repeated lookups don't hit the upstream again
+- Request coalescing: concurrent identical lookups share a single upstream call
+- Bounded concurrency towards the upstream
+
+Run this file directly to start a local HTTP stand-in for the upstream API:
+  python src/langgraph_mcp/local_mcp_servers/weather_upstream.py
+  WEATHER_SOURCE_URL=http://127.0.0.1:8002 python src/langgraph_mcp/local_mcp_servers/weather_server.py
+"""
+
+import asyncio
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Awaitable, Callable, Protocol
+from urllib.parse import parse_qs, urlparse
+
+# Mock weather data - in real implementation, you'd call a weather API
+MOCK_WEATHER_DATA = {
+    "nyc": "Sunny, 72°F",
+    "london": "Cloudy, 65°F",
+    "tokyo": "Rainy, 68°F",
+    "paris": "Partly cloudy, 70°F",
+}
+
+
+class WeatherSource(Protocol):
+    """Backend that the upstream layer fetches weather data from"""
+
+    async def current(self, city: str) -> str: ...
+
+    async def forecast(self, city: str, days: int) -> str: ...
+
+
+class MockWeatherSource:
+    """Serves the static mock data (no network)"""
+
+    def __init__(self, data: dict[str, str] = MOCK_WEATHER_DATA):
+        self.data = data
+
+    async def current(self, city: str) -> str:
+        return self.data.get(city.lower(), f"Weather data not available for {city}")
+
+    async def forecast(self, city: str, days: int) -> str:
+        return f"Forecast for {city}: Sunny for the next {days} days"
+
+
+class HttpWeatherSource:
+    """Fetches weather data from an HTTP API (e.g. the local stand-in below)"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        import httpx
+
+        self.client = httpx.AsyncClient(base_url=base_url.rstrip("/"), timeout=timeout)
+
+    async def current(self, city: str) -> str:
+        response = await self.client.get("/weather", params={"city": city})
+        response.raise_for_status()
+        return response.json()["result"]
+
+    async def forecast(self, city: str, days: int) -> str:
+        response = await self.client.get(
+            "/forecast", params={"city": city, "days": days}
+        )
+        response.raise_for_status()
+        return response.json()["result"]
+
+
+class UpstreamWeather:
+    """Cached, coalescing and concurrency-bounded access to a WeatherSource"""
+
+    def __init__(
+        self,
+        source: WeatherSource,
+        ttl: float = 300.0,
+        max_concurrency: int = 4,
+        max_entries: int = 1024,
+    ):
+        self.source = source
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.cache: dict[tuple, tuple[float, str]] = {}
+        self.in_flight: dict[tuple, asyncio.Task] = {}
+        self.waiters: dict[tuple, int] = {}
+
+    async def current(self, city: str) -> str:
+        return await self._get(("current", city.lower()), self.source.current, city)
+
+    async def forecast(self, city: str, days: int = 3) -> str:
+        return await self._get(
+            ("forecast", city.lower(), days), self.source.forecast, city, days
+        )
+
+    async def _get(
+        self, key: tuple, fetch: Callable[..., Awaitable[str]], *args
+    ) -> str:
+        # 1. Fresh cache hit
+        cached = self.cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        # 2. Start the upstream fetch in its own task, unless an identical lookup
+        # is already running; all callers wait on the same task
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, fetch, *args))
+            self.in_flight[key] = task
+
+        # 3. A cancelled caller only stops waiting; the fetch is cancelled when
+        # nobody is waiting for it anymore
+        self.waiters[key] = self.waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiters[key] -= 1
+            if self.waiters[key] == 0:
+                del self.waiters[key]
+                if not task.done():
+                    # Forget the orphaned fetch now, so a caller arriving while it
+                    # unwinds starts a new fetch instead of getting its CancelledError
+                    if self.in_flight.get(key) is task:
+                        del self.in_flight[key]
+                    task.cancel()
+
+    async def _fetch(self, key: tuple, fetch: Callable[..., Awaitable[str]], *args):
+        try:
+            async with self.semaphore:
+                result = await fetch(*args)
+            self._store(key, result)
+            return result
+        finally:
+            if self.in_flight.get(key) is asyncio.current_task():
+                del self.in_flight[key]
+
+    def _store(self, key: tuple, result: str):
+        """Cache a result, pruning expired entries and the oldest beyond max_entries"""
+        now = time.monotonic()
+        for old_key in [k for k, (at, _) in self.cache.items() if now - at >= self.ttl]:
+            del self.cache[old_key]
+        self.cache.pop(key, None)
+        self.cache[key] = (now, result)
+        while len(self.cache) > self.max_entries:
+            del self.cache[next(iter(self.cache))]
+
+
+def create_upstream() -> UpstreamWeather:
+    """Create the upstream layer for the configured source (mock by default)"""
+    base_url = os.getenv("WEATHER_SOURCE_URL")
+    source = HttpWeatherSource(base_url) if base_url else MockWeatherSource()
+    return UpstreamWeather(
+        source,
+        ttl=float(os.getenv("WEATHER_CACHE_TTL", 300)),
+        max_concurrency=int(os.getenv("WEATHER_MAX_CONCURRENCY", 4)),
+    )
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Local HTTP stand-in for a weather API, serving the mock data"""
+
+    source = MockWeatherSource()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        city = params.get("city", "")
+
+        if url.path == "/weather":
+            result = asyncio.run(self.source.current(city))
+        elif url.path == "/forecast":
+            result = asyncio.run(self.source.forecast(city, int(params.get("days", 3))))
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps({"city": city, "result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("PORT", 8002))
+    print(f"Weather API stand-in on http://127.0.0.1:{port}")
+    ThreadingHTTPServer(("127.0.0.1", port), _StandInHandler).serve_forever()
@@ -0,0 +1,236 @@
+"""Per-server health monitoring and circuit breaking for MCP tools"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+
+import anyio
+from langchain_core.runnables import RunnableConfig
+from mcp.shared.exceptions import McpError
+
+from langgraph_mcp.utils import percentile_ms
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Errors of the server or its session (besides timeouts). Anything else a tool raises
+# (e.g. ToolException for an isError result) is the tool's answer, not server health.
+SESSION_ERRORS = (
+    McpError,
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    OSError,
+)
+
+
+class ServerHealth:
+    """Error/latency tracking and circuit breaker state of one MCP server"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.calls = 0
+        self.errors = 0
+        self.last_error = ""
+        self.latencies: deque[float] = deque(maxlen=200)
+
+    def allow_call(self) -> bool:
+        """Closed: allow. Open: fail fast until reset_timeout, then allow one probe."""
+        if (
+            self.state == OPEN
+            and time.monotonic() - self.opened_at >= self.reset_timeout
+        ):
+            self.state = HALF_OPEN
+            return True
+        return self.state == CLOSED
+
+    def record_success(self, seconds: float):
+        self.calls += 1
+        self.latencies.append(seconds)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+
+    def end_probe(self):
+        """A probe ended without a verdict (cancelled, tool error): stay open a while"""
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def record_failure(self, error: str):
+        self.calls += 1
+        self.errors += 1
+        self.last_error = error
+        self.consecutive_failures += 1
+        if (
+            self.state == HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    @property
+    def retry_after(self) -> int:
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return max(int(remaining), 0)
+
+    def summary(self) -> dict:
+        return {
+            "state": self.state,
+            "calls": self.calls,
+            "errors": self.errors,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "p50_ms": percentile_ms(self.latencies, 50),
+            "p95_ms": percentile_ms(self.latencies, 95),
+        }
+
+
+class MCPHealthMonitor:
+    """
+    Wraps MCP tools with a per-server circuit breaker and pings the servers periodically.
+
+    - Each tool call is bounded by call_timeout; timeouts and session/transport errors
+      count as failures (tool-level errors don't), and so do failed pings
+    - After failure_threshold consecutive failures the server's circuit opens: its tools
+      return a structured error immediately instead of waiting for a timeout, and the
+      server is stopped
+    - After reset_timeout one probe (ping or tool call, bounded by probe_timeout) is let
+      through (half-open) and respawns the server; when it succeeds the circuit closes
+    """
+
+    def __init__(
+        self,
+        servers: dict,
+        call_timeout: float = 60.0,
+        ping_interval: float = 15.0,
+        ping_timeout: float = 5.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        probe_timeout: float = 15.0,
+    ):
+        self.servers = servers
+        self.call_timeout = call_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.probe_timeout = probe_timeout
+        self.health = {
+            name: ServerHealth(failure_threshold, reset_timeout) for name in servers
+        }
+        self.task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls, servers: dict):
+        return cls(
+            servers,
+            call_timeout=float(os.getenv("MCP_CALL_TIMEOUT", 60)),
+            ping_interval=float(os.getenv("MCP_PING_INTERVAL", 15)),
+            failure_threshold=int(os.getenv("MCP_FAILURE_THRESHOLD", 3)),
+            reset_timeout=float(os.getenv("MCP_RESET_TIMEOUT", 30)),
+            probe_timeout=float(os.getenv("MCP_PROBE_TIMEOUT", 15)),
+        )
+
+    def wrap_tools(self, tools):
+        """Route every MCP tool call through its server's circuit breaker"""
+        for tool in tools:
+            server_name = (tool.metadata or {}).get("mcp_server")
+            if server_name in self.health and tool.coroutine:
+                tool.coroutine = self._guard(server_name, tool.name, tool.coroutine)
+        return tools
+
+    def start(self):
+        self.task = asyncio.create_task(self._ping_loop())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    def summary(self) -> dict:
+        return {name: health.summary() for name, health in self.health.items()}
+
+    def _guard(self, server_name: str, tool_name: str, coroutine):
+        health = self.health[server_name]
+
+        # config is passed through, so the tool can report progress to its run
+        async def guarded(config: RunnableConfig = None, **arguments):
+            if not health.allow_call():
+                return _unavailable(server_name, tool_name, health), None
+
+            probe = health.state == HALF_OPEN
+            timeout = self.probe_timeout if probe else self.call_timeout
+            start = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    coroutine(config=config, **arguments), timeout
+                )
+            except asyncio.TimeoutError:
+                await self._failed(server_name, f"timeout after {timeout}s")
+                return _unavailable(server_name, tool_name, health), None
+            except SESSION_ERRORS as e:
+                await self._failed(server_name, str(e) or type(e).__name__)
+                raise
+            finally:
+                if probe:
+                    health.end_probe()
+            health.record_success(time.monotonic() - start)
+            return result
+
+        return guarded
+
+    async def _failed(self, name: str, error: str):
+        """Record a failure; stop the server once its circuit is open (probe respawns)"""
+        health = self.health[name]
+        health.record_failure(error)
+        if health.state == OPEN:
+            await self.servers[name].reset()
+
+    async def _ping_loop(self):
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await asyncio.gather(
+                *(self._ping(name, server) for name, server in self.servers.items())
+            )
+
+    async def _ping(self, name: str, server):
+        health = self.health[name]
+        # Only ping servers that are running (lazy servers stay unspawned), except
+        # for half-open probes, which (re)spawn the server
+        running = server.ready is not None and server.ready.done()
+        if not running and health.state == CLOSED:
+            return
+        if not health.allow_call():
+            return
+
+        probe = health.state == HALF_OPEN
+        start = time.monotonic()
+        try:
+            session = await asyncio.wait_for(
+                server.session(), self.probe_timeout if probe else self.ping_timeout
+            )
+            await asyncio.wait_for(session.send_ping(), self.ping_timeout)
+            health.record_success(time.monotonic() - start)
+        except Exception as e:
+            # Counts toward failure_threshold like a failed call: one slow ping
+            # does not restart a server that is otherwise healthy
+            await self._failed(name, f"ping failed: {e or type(e).__name__}")
+        finally:
+            if probe:
+                health.end_probe()
+
+
+def _unavailable(server_name: str, tool_name: str, health: ServerHealth) -> str:
+    """Structured error the agent can act on (use other tools, or retry later)"""
+    return json.dumps(
+        {
+            "error": "mcp_server_unavailable",
+            "server": server_name,
+            "tool": tool_name,
+            "reason": health.last_error,
+            "retry_after_seconds": health.retry_after,
+            "hint": "Do not retry this tool now. Continue with other tools or tell the user this step failed.",
+        }
+    )
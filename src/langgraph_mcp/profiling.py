@@ -0,0 +1,60 @@
+"""On-demand, per-request profiling of chat runs (opt-in, gated by configuration)"""
+
+import os
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import Request
+
+# Profiling is only available when CHAT_PROFILING=true (never by default)
+PROFILING_ENABLED = os.getenv("CHAT_PROFILING", "false").lower() == "true"
+PROFILE_DIR = Path(os.getenv("CHAT_PROFILE_DIR", "profiles"))
+# Sampling interval and maximum profiled time bound the profiler's overhead
+PROFILE_INTERVAL = max(float(os.getenv("CHAT_PROFILE_INTERVAL", 0.005)), 0.001)
+PROFILE_MAX_SECONDS = float(os.getenv("CHAT_PROFILE_MAX_SECONDS", 120))
+
+
+def profiling_requested(request: Request) -> bool:
+    """Profile this request? (X-Profile: 1 header or ?profile=1, and enabled in config)"""
+    if not PROFILING_ENABLED:
+        return False
+    flag = request.headers.get("x-profile") or request.query_params.get("profile")
+    return flag in ("1", "true")
+
+
+async def profile_stream(event_stream, thread_id: str):
+    """
+    Run an event stream under pyinstrument's async-aware sampling profiler.
+    Writes a speedscope flamegraph (.speedscope.json) and an HTML report to PROFILE_DIR.
+    """
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+    except ImportError:
+        print("Profiling requested but pyinstrument is not installed")
+        async for chunk in event_stream:
+            yield chunk
+        return
+
+    profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+    start = time.monotonic()
+    profiler.start()
+    try:
+        async for chunk in event_stream:
+            if profiler.is_running and time.monotonic() - start > PROFILE_MAX_SECONDS:
+                # Cap the overhead: keep streaming, stop sampling
+                profiler.stop()
+            yield chunk
+    finally:
+        if profiler.is_running:
+            profiler.stop()
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        name = f"chat-{time.strftime('%Y%m%d-%H%M%S')}-{thread_id[:8]}-{uuid.uuid4().hex[:6]}"
+        flamegraph = PROFILE_DIR / f"{name}.speedscope.json"
+        flamegraph.write_text(profiler.output(SpeedscopeRenderer()), encoding="utf-8")
+        (PROFILE_DIR / f"{name}.html").write_text(
+            profiler.output_html(), encoding="utf-8"
+        )
+        print(f"Profile written to {flamegraph} (open in https://www.speedscope.app)")
@@ -0,0 +1,137 @@
+"""Latency-hedged model routing between a local (cheap) and a remote (large) LLM"""
+
+import asyncio
+import time
+from collections import defaultdict, deque
+
+from langgraph_mcp.utils import SILENT, percentile_ms
+
+# Tag of the tool-selection turn: its events still stream (so tool calls can be
+# speculated on), but the chat doesn't show its text (see streaming_utils.py)
+PROBE_TAG = "routing_probe"
+
+
+class RouteStats:
+    """Rolling latency per route (shared by all bound copies of a RoutingLLM)"""
+
+    def __init__(self, window: int = 500):
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.counts = defaultdict(int)
+
+    def record(self, route: str, seconds: float):
+        self.latencies[route].append(seconds)
+        self.counts[route] += 1
+
+    def summary(self) -> dict:
+        result = {}
+        for route, values in self.latencies.items():
+            result[route] = {
+                "count": self.counts[route],
+                "p50_ms": percentile_ms(values, 50),
+                "p95_ms": percentile_ms(values, 95),
+            }
+        return result
+
+
+# Default stats shared by all routed models in this process (see /llm/metrics)
+route_stats = RouteStats()
+
+
+class RoutingLLM:
+    """
+    Routes each assistant turn between two chat models:
+
+    - Cheap turns (picking tools and their arguments) go to the local model
+    - When the local model wants to answer instead of calling a tool, the final
+      answer turn goes to the large remote model
+    - When the primary model of a turn is slower than hedge_after seconds, the same
+      request is sent to the other model too and whichever answers first is used
+
+    local and remote can be any chat models (e.g. fake chat models in tests).
+    Answers that end a turn always carry finish_reason="stop" (Ollama only sets
+    done_reason), so the chat shows them even when they were not streamed.
+    """
+
+    def __init__(
+        self, local, remote, hedge_after: float = 5.0, stats: RouteStats = None
+    ):
+        self.local = local
+        self.remote = remote
+        self.hedge_after = hedge_after
+        self.stats = stats or route_stats
+
+    def bind_tools(self, tools, **kwargs):
+        return RoutingLLM(
+            self.local.bind_tools(tools, **kwargs),
+            self.remote.bind_tools(tools, **kwargs),
+            self.hedge_after,
+            self.stats,
+        )
+
+    async def ainvoke(self, messages, config=None):
+        # 1. Cheap turn: let the local model select tools (text not shown in the chat)
+        probe = {**(config or {}), "tags": [*(config or {}).get("tags", []), PROBE_TAG]}
+        try:
+            response, hedged = await self._hedged(
+                "local", self.local, "remote", self.remote, messages, probe, probe
+            )
+            # The remote hedge won -> its answer is as good as the final turn's
+            if hedged or getattr(response, "tool_calls", None):
+                return _mark_final(response)
+        except Exception as e:
+            print(f"Local model failed, using remote model: {e}")
+
+        # 2. Final answer turn: large model (a slow one is hedged silently)
+        response, _ = await self._hedged(
+            "remote", self.remote, "local", self.local, messages, config, SILENT
+        )
+        return _mark_final(response)
+
+    def invoke(self, messages, config=None):
+        return asyncio.run(self.ainvoke(messages, config))
+
+    async def _hedged(
+        self, route, primary, hedge_route, hedge, messages, config, hedge_config
+    ):
+        """
+        Call primary, and also hedge if primary exceeds hedge_after; first answer wins.
+        Returns (response, whether the hedge answered).
+        """
+        start = time.monotonic()
+        primary_task = asyncio.create_task(primary.ainvoke(messages, config=config))
+        tasks = {primary_task: route}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after)
+            if not done:
+                # Primary is slow -> send a hedged request to the other model
+                hedge_task = asyncio.create_task(
+                    hedge.ainvoke(messages, config=hedge_config)
+                )
+                tasks[hedge_task] = f"{route}->{hedge_route} (hedge)"
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        self.stats.record(tasks[task], time.monotonic() - start)
+                        return task.result(), task is not primary_task
+            # Every request failed -> raise the primary's error
+            return primary_task.result(), False
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def _mark_final(response):
+    """Give a final answer the finish_reason the chat looks for (Ollama sets done_reason)"""
+    metadata = getattr(response, "response_metadata", None)
+    if (
+        isinstance(metadata, dict)
+        and not getattr(response, "tool_calls", None)
+        and "finish_reason" not in metadata
+    ):
+        metadata["finish_reason"] = metadata.get("done_reason", "stop")
+    return response
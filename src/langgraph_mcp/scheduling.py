@@ -0,0 +1,300 @@
+"""Admission control and fair scheduling for chat requests"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable
+
+from langgraph_mcp.utils import percentile_ms
+
+
+class SchedulerFull(Exception):
+    """Raised when a request can't be queued (maps to 429 / 503 with Retry-After)"""
+
+    def __init__(self, message: str, status_code: int, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """An admitted request holding one concurrency slot until released"""
+
+    def __init__(self, scheduler, client_id: str, queue_time: float):
+        self.scheduler = scheduler
+        self.client_id = client_id
+        self.queue_time = queue_time
+        self.released = False
+
+    def release(self):
+        # Idempotent: the stream and the response background task may both release
+        if not self.released:
+            self.released = True
+            self.scheduler._release()
+
+
+class ChatScheduler:
+    """
+    Bounded global concurrency with a per-client fair queue.
+
+    - At most max_concurrency chat runs are active at once
+    - Waiting requests are queued per client and woken round-robin across clients,
+      so one client sending a burst can't starve the others
+    - When the queues are full, requests are rejected immediately:
+      429 when the client's own queue is full, 503 when the global queue is full
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        max_queue_per_client: int = 4,
+        retry_after: int = 5,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_queue_per_client = max_queue_per_client
+        self.retry_after = retry_after
+
+        self.active = 0
+        self.waiting: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+
+        # Metrics
+        self.admitted = 0
+        self.rejected = {429: 0, 503: 0}
+        self.queue_times: deque[float] = deque(maxlen=1000)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_concurrency=int(os.getenv("CHAT_MAX_CONCURRENCY", 4)),
+            max_queue=int(os.getenv("CHAT_MAX_QUEUE", 32)),
+            max_queue_per_client=int(os.getenv("CHAT_MAX_QUEUE_PER_CLIENT", 4)),
+            retry_after=int(os.getenv("CHAT_RETRY_AFTER", 5)),
+        )
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self.waiting.values())
+
+    async def admit(self, client_id: str) -> Ticket:
+        """Wait for a free slot (fair across clients) or raise SchedulerFull"""
+        start = time.monotonic()
+
+        if self.active < self.max_concurrency and not self.waiting:
+            self.active += 1
+            return self._admitted(client_id, start)
+
+        client_queue = self.waiting.get(client_id, ())
+        if len(client_queue) >= self.max_queue_per_client:
+            self.rejected[429] += 1
+            raise SchedulerFull(
+                "Too many queued requests for this client", 429, self.retry_after
+            )
+        if self.queued >= self.max_queue:
+            self.rejected[503] += 1
+            raise SchedulerFull(
+                "Server is busy, try again later", 503, self.retry_after
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.setdefault(client_id, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just before the cancel -> give it back
+                self._release()
+            else:
+                self._discard(client_id, future)
+            raise
+        return self._admitted(client_id, start)
+
+    def metrics(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "admitted": self.admitted,
+            "rejected_429": self.rejected[429],
+            "rejected_503": self.rejected[503],
+            "queue_time_ms_p50": percentile_ms(self.queue_times, 50),
+            "queue_time_ms_p95": percentile_ms(self.queue_times, 95),
+            "queue_time_ms_max": percentile_ms(self.queue_times, 100),
+        }
+
+    def _admitted(self, client_id: str, start: float) -> Ticket:
+        queue_time = time.monotonic() - start
+        self.admitted += 1
+        self.queue_times.append(queue_time)
+        return Ticket(self, client_id, queue_time)
+
+    def _release(self):
+        self.active -= 1
+        self._wake_next()
+
+    def _wake_next(self):
+        """Hand free slots to waiting clients in round-robin order"""
+        while self.active < self.max_concurrency and self.waiting:
+            client_id, client_queue = self.waiting.popitem(last=False)
+            future = client_queue.popleft()
+            if client_queue:
+                # Client goes to the back of the line for its next request
+                self.waiting[client_id] = client_queue
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    def _discard(self, client_id: str, future: asyncio.Future):
+        client_queue = self.waiting.get(client_id)
+        if client_queue and future in client_queue:
+            client_queue.remove(future)
+            if not client_queue:
+                del self.waiting[client_id]
+
+
+class SharedRun:
+    """One graph run whose output chunks can be streamed to several requests"""
+
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.task: asyncio.Task | None = None
+        self.condition = asyncio.Condition()
+
+    async def append(self, chunk: str):
+        async with self.condition:
+            self.chunks.append(chunk)
+            self.condition.notify_all()
+
+    async def finish(self, error: BaseException | None = None):
+        async with self.condition:
+            self.done = True
+            self.error = error
+            self.condition.notify_all()
+
+    async def subscribe(self):
+        """Replay the chunks produced so far, then follow the run until it ends"""
+        self.subscribers += 1
+        position = 0
+        try:
+            while True:
+                async with self.condition:
+                    await self.condition.wait_for(
+                        lambda: len(self.chunks) > position or self.done
+                    )
+                    new_chunks = self.chunks[position:]
+                    finished = self.done
+                position += len(new_chunks)
+                for chunk in new_chunks:
+                    yield chunk
+                if finished and position == len(self.chunks):
+                    break
+            # The run failed -> every subscriber sees the error, like a direct stream
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.subscribers -= 1
+            # Nobody is listening anymore -> stop the graph run (like a disconnect)
+            if self.subscribers == 0 and self.task and not self.task.done():
+                self.task.cancel()
+
+
+class ThreadRuns:
+    """
+    Serializes graph runs per thread_id and deduplicates identical in-flight requests.
+
+    - Runs on the same thread_id execute one after another (no forked checkpoint state)
+    - A run waits for its thread's turn first and only then for a scheduler slot, so
+      queued runs on a busy thread don't hold concurrency slots while they wait
+    - The run owns its slot until it ends, whichever requests are still attached
+    - A request with the same thread_id and input as a running request (e.g. a
+      double-submit) attaches to that run's stream instead of starting a new run
+    """
+
+    def __init__(self):
+        self.in_flight: dict[tuple[str, str], SharedRun] = {}
+        self.locks: dict[str, asyncio.Lock] = {}
+        self.lock_users: dict[str, int] = {}
+
+    def is_running(self, thread_id: str, user_input: str) -> bool:
+        return (thread_id, user_input) in self.in_flight
+
+    async def start(
+        self,
+        thread_id: str,
+        user_input: str,
+        make_stream,
+        admit: Callable[[], Awaitable[Ticket]] = None,
+    ):
+        """
+        Return an async iterator over the run for (thread_id, user_input).
+        A new run waits for the thread to be free, then for admit() (which may raise
+        SchedulerFull), then make_stream() creates its event stream.
+        """
+        key = (thread_id, user_input)
+        run = self.in_flight.get(key)
+        if run is not None:
+            return run.subscribe()
+
+        run = SharedRun()
+        self.in_flight[key] = run
+        lock = self.locks.setdefault(thread_id, asyncio.Lock())
+        self.lock_users[thread_id] = self.lock_users.get(thread_id, 0) + 1
+        try:
+            await lock.acquire()
+            try:
+                ticket = await admit() if admit else None
+            except BaseException:
+                lock.release()
+                raise
+        except BaseException as e:
+            self._forget(key)
+            # Requests that attached meanwhile see why the run never started
+            if isinstance(e, Exception):
+                await run.finish(e)
+            else:
+                await run.finish(RuntimeError("Run was cancelled before it started"))
+            raise
+
+        run.task = asyncio.create_task(
+            self._produce(key, run, make_stream, lock, ticket)
+        )
+        return run.subscribe()
+
+    async def _produce(
+        self,
+        key: tuple[str, str],
+        run: SharedRun,
+        make_stream,
+        lock: asyncio.Lock,
+        ticket: Ticket | None,
+    ):
+        error = None
+        try:
+            event_stream = make_stream()
+            try:
+                async for chunk in event_stream:
+                    await run.append(chunk)
+            finally:
+                await event_stream.aclose()
+        except Exception as e:
+            # Handed to the subscribers instead of being left on the task
+            error = e
+        finally:
+            if ticket:
+                ticket.release()
+            lock.release()
+            self._forget(key)
+            await run.finish(error)
+
+    def _forget(self, key: tuple[str, str]):
+        thread_id = key[0]
+        del self.in_flight[key]
+        self.lock_users[thread_id] -= 1
+        if self.lock_users[thread_id] == 0:
+            del self.lock_users[thread_id]
+            del self.locks[thread_id]
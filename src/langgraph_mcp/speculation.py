@@ -0,0 +1,144 @@
+"""Speculative execution of side-effect-free tools while tool-call arguments stream"""
+
+import asyncio
+import inspect
+import json
+import time
+from fnmatch import fnmatch
+
+from langchain_core.runnables import RunnableConfig
+
+# Tools that only read or compute, so running them early (or for nothing) is safe.
+# Tools that report progress (get_weather_batch, get_forecast_batch) are left out:
+# a speculative call runs outside the graph run, so its progress would be lost.
+SIDE_EFFECT_FREE_TOOLS = [
+    "add",
+    "multiply",
+    "divide",
+    "evaluate",
+    "batch_*",
+    "get_weather",
+    "get_forecast",
+    "list_all_files",
+    "list_python_files",
+    "show_functions",
+    "read_function",
+    "read_lines",
+    "read_range",
+    "read_file",
+    "read_text_file",
+    "read_multiple_files",
+    "list_directory",
+    "directory_tree",
+    "get_file_info",
+    "git_status",
+    "git_diff*",
+    "git_log",
+    "git_show",
+]
+
+
+class SpeculativeToolExecutor:
+    """
+    Starts side-effect-free tools as soon as their arguments are complete JSON in the
+    model's token stream, instead of waiting for the whole AIMessage and the tools node.
+
+    - feed() gets the tool_call_chunks of every on_chat_model_stream event, with the
+      thread_id of the run they belong to
+    - The speculative tools are wrapped: when ToolNode calls one with the same name and
+      arguments on the same thread, it awaits the running speculative result instead
+      of calling again (results are never shared across threads)
+    - message_done() is called when a model message ends, complete() when the run ends:
+      results the run didn't claim are dropped then (ttl is only a backstop)
+    """
+
+    def __init__(
+        self, tools, patterns: list[str] = SIDE_EFFECT_FREE_TOOLS, ttl: float = 60.0
+    ):
+        self.ttl = ttl
+        self.coroutines = {}
+        self.partial_calls: dict[tuple, dict] = {}
+        self.started: dict[tuple[str, str, str], tuple[float, asyncio.Task]] = {}
+        self.stats = {"started": 0, "hits": 0, "misses": 0, "expired": 0}
+
+        for tool in tools:
+            if getattr(tool, "coroutine", None) and any(
+                fnmatch(tool.name, pattern) for pattern in patterns
+            ):
+                self.coroutines[tool.name] = tool.coroutine
+                tool.coroutine = self._wrap(tool.name, tool.coroutine)
+
+    def feed(self, thread_id: str, run_id: str, tool_call_chunks: list[dict]):
+        """Accumulate argument deltas and start tools whose arguments are complete"""
+        for chunk in tool_call_chunks or []:
+            key = (run_id, chunk.get("index", 0))
+            call = self.partial_calls.setdefault(
+                key, {"name": "", "args": "", "done": False}
+            )
+            call["name"] += chunk.get("name") or ""
+            call["args"] += chunk.get("args") or ""
+
+            if call["done"] or call["name"] not in self.coroutines:
+                continue
+            # Cheap check first, only try to parse when the object may be closed
+            if not call["args"].rstrip().endswith("}"):
+                continue
+            try:
+                args = json.loads(call["args"])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(args, dict):
+                call["done"] = True
+                self._start(thread_id, call["name"], args)
+
+    def message_done(self, run_id: str):
+        """The model message is complete: forget its partial calls"""
+        for key in [key for key in self.partial_calls if key[0] == run_id]:
+            del self.partial_calls[key]
+        self._expire()
+
+    def complete(self, thread_id: str):
+        """The run on thread_id ended: drop the results it didn't claim"""
+        for key in [key for key in self.started if key[0] == thread_id]:
+            _, task = self.started.pop(key)
+            task.cancel()
+            self.stats["expired"] += 1
+
+    def _start(self, thread_id: str, name: str, args: dict):
+        key = (thread_id, name, _canonical(args))
+        if key in self.started:
+            return
+        task = asyncio.create_task(self.coroutines[name](**args))
+        # Nobody may claim the result, so never leave an exception unretrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.started[key] = (time.monotonic(), task)
+        self.stats["started"] += 1
+
+    def _wrap(self, name: str, coroutine):
+        # Keep passing the run config to tools that take it (e.g. for progress)
+        takes_config = "config" in inspect.signature(coroutine).parameters
+
+        async def speculative_or_call(config: RunnableConfig, **kwargs):
+            thread_id = config.get("configurable", {}).get("thread_id")
+            entry = self.started.pop((thread_id, name, _canonical(kwargs)), None)
+            if entry is not None:
+                self.stats["hits"] += 1
+                return await entry[1]
+            self.stats["misses"] += 1
+            if takes_config:
+                return await coroutine(config=config, **kwargs)
+            return await coroutine(**kwargs)
+
+        return speculative_or_call
+
+    def _expire(self):
+        now = time.monotonic()
+        for key, (started_at, task) in list(self.started.items()):
+            if now - started_at > self.ttl:
+                del self.started[key]
+                task.cancel()
+                self.stats["expired"] += 1
+
+
+def _canonical(args: dict) -> str:
+    return json.dumps(args, sort_keys=True, default=str)
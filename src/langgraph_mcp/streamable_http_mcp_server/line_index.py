@@ -0,0 +1,142 @@
+"""
+Line-offset index over memory-mapped files for the code-explorer server
+
+The first read of a file maps it and records the byte offset of every line start.
+After that, any line or byte range is a slice of the mapping (constant time per slice).
+Indexes are invalidated when the file's mtime or size changes, and evicted
+least-recently-used once the total index memory or the number of indexed files
+exceeds its cap.
+"""
+
+import mmap
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+
+class LineIndex:
+    """Memory-mapped file with the byte offsets of its line starts"""
+
+    def __init__(self, path: Path):
+        stat = path.stat()
+        self.path = path
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.size = stat.st_size
+        self.map = None
+        # offsets[i] = byte offset of line i + 1, last entry = file size
+        self.offsets = array("Q", [0])
+
+        if self.size == 0:
+            return
+
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        position = self.map.find(b"\n")
+        while position != -1:
+            self.offsets.append(position + 1)
+            position = self.map.find(b"\n", position + 1)
+        if self.offsets[-1] != self.size:
+            self.offsets.append(self.size)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def memory(self) -> int:
+        """Approximate memory held by the index (the mapping itself is paged by the OS)"""
+        return self.offsets.itemsize * len(self.offsets)
+
+    def is_stale(self) -> bool:
+        stat = self.path.stat()
+        return (stat.st_mtime_ns, stat.st_size) != self.signature
+
+    def read_lines(self, start: int, end: int) -> bytes:
+        """Read lines start..end (1-based, inclusive)"""
+        start = max(start, 1)
+        end = min(end, self.line_count)
+        if self.map is None or start > end:
+            return b""
+        return self.map[self.offsets[start - 1] : self.offsets[end]]
+
+    def read_bytes(self, start: int, end: int) -> bytes:
+        """Read bytes start..end (0-based, end exclusive)"""
+        if self.map is None:
+            return b""
+        return self.map[max(start, 0) : min(end, self.size)]
+
+    def line_of_byte(self, offset: int) -> int:
+        """1-based line number that contains a byte offset"""
+        low, high = 0, self.line_count
+        while low < high:
+            mid = (low + high) // 2
+            if self.offsets[mid + 1] <= offset:
+                low = mid + 1
+            else:
+                high = mid
+        return low + 1
+
+    def close(self):
+        """Unmap now (only safe once no other thread uses this index)"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+class LineIndexCache:
+    """Thread-safe LRU cache of LineIndex objects with memory and file-count caps"""
+
+    def __init__(self, max_memory: int = 64 * 1024 * 1024, max_files: int = 256):
+        self.max_memory = max_memory
+        # Every index holds an open mapping, so bound their number as well
+        self.max_files = max_files
+        self.memory = 0
+        self.indexes: OrderedDict[Path, LineIndex] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, path: Path) -> LineIndex:
+        path = path.resolve()
+        with self.lock:
+            index = self.indexes.get(path)
+            if index is not None:
+                self.indexes.move_to_end(path)
+        if index is not None and not index.is_stale():
+            return index
+
+        # Map and scan outside the lock, so reads of other files are not blocked
+        index = LineIndex(path)
+        with self.lock:
+            current = self.indexes.get(path)
+            if current is not None and current.signature == index.signature:
+                # Another thread indexed the same version meanwhile
+                return current
+            if current is not None:
+                self._remove(path)
+            self.indexes[path] = index
+            self.memory += index.memory
+            self._evict(keep=path)
+            return index
+
+    def _remove(self, path: Path):
+        index = self.indexes.pop(path)
+        self.memory -= index.memory
+        # No close() here: another thread may still be reading from this index.
+        # The mapping is released when the last reference to the index goes away.
+
+    def _evict(self, keep: Path):
+        while (
+            self.memory > self.max_memory or len(self.indexes) > self.max_files
+        ) and len(self.indexes) > 1:
+            oldest = next(iter(self.indexes))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+
+
+line_index_cache = LineIndexCache(
+    max_memory=int(os.getenv("LINE_INDEX_MAX_MEMORY", 64 * 1024 * 1024)),
+    max_files=int(os.getenv("LINE_INDEX_MAX_FILES", 256)),
+)
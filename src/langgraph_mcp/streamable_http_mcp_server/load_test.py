@@ -0,0 +1,119 @@
+"""
+Local load test for the code-explorer MCP server
+
+Sends concurrent JSON-RPC tools/call requests and reports requests per second
+and latency percentiles per tool.
+
+Usage:
+  WORKERS=4 python src/langgraph_mcp/streamable_http_mcp_server/server-code-explorer.py
+  python src/langgraph_mcp/streamable_http_mcp_server/load_test.py --requests 500 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from langgraph_mcp.utils import percentile_ms
+
+# Tool calls to benchmark (tool name -> arguments)
+TOOL_CALLS = {
+    "list_all_files": {"folder": "."},
+    "list_python_files": {"folder": "."},
+    "show_functions": {"file_path": "streaming_utils.py"},
+    "read_function": {
+        "file_path": "streaming_utils.py",
+        "function_name": "truncate_messages_safely",
+    },
+    "read_lines": {"file_path": "streaming_utils.py", "start_line": 1, "end_line": 200},
+    "read_range": {
+        "file_path": "streaming_utils.py",
+        "start_byte": 0,
+        "end_byte": 8192,
+    },
+}
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream",
+    "Accept-Encoding": "gzip",
+}
+
+
+class ToolCallError(Exception):
+    """The server answered, but with a JSON-RPC error or a tool error result"""
+
+
+async def call_tool(client: httpx.AsyncClient, url: str, name: str, arguments: dict):
+    """Send one tools/call request (stateless mode needs no initialize handshake)"""
+    payload = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }
+    response = await client.post(url, json=payload, headers=HEADERS)
+    response.raise_for_status()
+    # The server runs with json_response=True, so the body is the JSON-RPC response
+    body = response.json()
+    if "error" in body:
+        raise ToolCallError(body["error"].get("message", "JSON-RPC error"))
+    if body["result"].get("isError"):
+        raise ToolCallError(f"{name} returned an error result")
+
+
+async def run_tool(
+    url: str, name: str, arguments: dict, requests: int, concurrency: int
+):
+    """Run `requests` calls of one tool with `concurrency` in flight"""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(timeout=30) as client:
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await call_tool(client, url, name, arguments)
+                    latencies.append(time.perf_counter() - start)
+                except (httpx.HTTPError, ValueError, ToolCallError):
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the code-explorer MCP server"
+    )
+    parser.add_argument("--url", default="http://localhost:8001/mcp")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    print(
+        f"{'tool':<20} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    for name, arguments in TOOL_CALLS.items():
+        latencies, errors, elapsed = await run_tool(
+            args.url, name, arguments, args.requests, args.concurrency
+        )
+        if not latencies:
+            print(f"{name:<20} all {errors} requests failed")
+            continue
+        print(
+            f"{name:<20} {len(latencies) / elapsed:>8.1f} "
+            f"{percentile_ms(latencies, 50):>8.1f} {percentile_ms(latencies, 90):>8.1f} "
+            f"{percentile_ms(latencies, 99):>8.1f} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
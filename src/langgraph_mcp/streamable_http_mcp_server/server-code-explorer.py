@@ -3,9 +3,15 @@ Code Explorer MCP Server
 Code explorer MCP server to explore Python files and functions -> expose with Streamable HTTP
 """
 
+import asyncio
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from fastmcp import FastMCP
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from line_index import line_index_cache
 
 # Initialize FastMCP server
 mcp = FastMCP("code-explorer")
@@ -13,8 +19,31 @@ mcp = FastMCP("code-explorer")
 # Get the root directory of the repository
 REPO_ROOT = Path(__file__).parent.parent.resolve()
 
+# Maximum size of a single read_lines / read_range response
+MAX_LINES_PER_READ = int(os.getenv("MAX_LINES_PER_READ", 2000))
+MAX_BYTES_PER_READ = int(os.getenv("MAX_BYTES_PER_READ", 256 * 1024))
+
+# Thread pool for blocking filesystem work (keeps the event loop responsive)
+FS_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("FS_THREADS", 8)), thread_name_prefix="code-explorer-fs"
+)
+
+
+def run_in_thread(func):
+    """Run a blocking tool function in FS_EXECUTOR instead of on the event loop"""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            FS_EXECUTOR, functools.partial(func, *args, **kwargs)
+        )
+
+    return wrapper
+
 
 @mcp.tool()
+@run_in_thread
 def list_all_files(folder: str = "src/langgraph_mcp") -> str:
     """
     Show all files and folders in a directory as a tree structure.
@@ -70,6 +99,7 @@ def list_all_files(folder: str = "src/langgraph_mcp") -> str:
 
 
 @mcp.tool()
+@run_in_thread
 def list_python_files(folder: str = "src/langgraph_mcp") -> str:
     """
     Show only Python files in a folder.
@@ -99,6 +129,7 @@ def list_python_files(folder: str = "src/langgraph_mcp") -> str:
 
 
 @mcp.tool()
+@run_in_thread
 def show_functions(file_path: str) -> str:
     """
     Show all functions in a Python file.
@@ -136,6 +167,7 @@ def show_functions(file_path: str) -> str:
 
 
 @mcp.tool()
+@run_in_thread
 def read_function(file_path: str, function_name: str) -> str:
     """
     Read the source code of a function.
@@ -193,6 +225,89 @@ def read_function(file_path: str, function_name: str) -> str:
     return result
 
 
+@mcp.tool()
+@run_in_thread
+def read_lines(file_path: str, start_line: int = 1, end_line: int = 200) -> str:
+    """
+    Read a range of lines from any file (1-based, inclusive).
+    Use this to read large files in slices, or code that is not inside a function.
+
+    Args:
+        file_path: Path to the file. Must be within repository root.
+        start_line: First line to read (default: 1)
+        end_line: Last line to read (default: 200). At most MAX_LINES_PER_READ lines are returned.
+    """
+    target = _normalize_path(file_path)
+
+    # Validate path is within repo root
+    _validate_path(target)
+
+    if not target.is_file():
+        return f"File '{file_path}' not found"
+    if start_line < 1 or end_line < start_line:
+        return f"Invalid line range {start_line}-{end_line} (lines start at 1)"
+
+    index = line_index_cache.get(target)
+    end_line = min(end_line, start_line + MAX_LINES_PER_READ - 1)
+    if start_line > index.line_count:
+        return f"{file_path} has only {index.line_count} lines"
+
+    data = index.read_lines(start_line, end_line)
+    end_line = min(end_line, index.line_count)
+    truncated = ""
+    if len(data) > MAX_BYTES_PER_READ:
+        # Report the line the byte cap actually stopped in
+        data = data[:MAX_BYTES_PER_READ]
+        first_byte = index.offsets[start_line - 1]
+        end_line = index.line_of_byte(first_byte + len(data) - 1)
+        truncated = f" (truncated to {MAX_BYTES_PER_READ} bytes)"
+
+    result = (
+        f"{file_path} lines {start_line}-{end_line} of {index.line_count}"
+        f"{truncated}:\n\n"
+    )
+    result += data.decode("utf-8", errors="replace")
+    return result
+
+
+@mcp.tool()
+@run_in_thread
+def read_range(file_path: str, start_byte: int = 0, end_byte: int = 65536) -> str:
+    """
+    Read a byte range from any file (0-based, end exclusive).
+
+    Args:
+        file_path: Path to the file. Must be within repository root.
+        start_byte: First byte to read (default: 0)
+        end_byte: Byte to stop at (default: 65536). At most MAX_BYTES_PER_READ bytes are returned.
+    """
+    target = _normalize_path(file_path)
+
+    # Validate path is within repo root
+    _validate_path(target)
+
+    if not target.is_file():
+        return f"File '{file_path}' not found"
+    if start_byte < 0 or end_byte <= start_byte:
+        return f"Invalid byte range {start_byte}-{end_byte} (bytes start at 0)"
+
+    index = line_index_cache.get(target)
+    end_byte = min(end_byte, start_byte + MAX_BYTES_PER_READ, index.size)
+    if start_byte >= end_byte:
+        return f"{file_path} has only {index.size} bytes"
+
+    data = index.read_bytes(start_byte, end_byte)
+    first_line = index.line_of_byte(start_byte)
+    last_line = index.line_of_byte(end_byte - 1)
+
+    result = (
+        f"{file_path} bytes {start_byte}-{end_byte} of {index.size} "
+        f"(lines {first_line}-{last_line}):\n\n"
+    )
+    result += data.decode("utf-8", errors="replace")
+    return result
+
+
 # Helper functions
 def _normalize_path(folder: str) -> Path:
     """
@@ -232,10 +347,29 @@ def _validate_path(path: Path) -> None:
         raise ValueError(f"Invalid path: {e}")
 
 
+# Production ASGI app: stateless HTTP sessions (any worker can serve any request),
+# plain JSON responses instead of SSE, and gzip for large responses
+app = mcp.http_app(
+    stateless_http=True,
+    json_response=True,
+    middleware=[Middleware(GZipMiddleware, minimum_size=1024)],
+)
+
+
 if __name__ == "__main__":
     print("Code Explorer MCP Server")
 
     port = int(os.getenv("PORT", 8001))
-
-    # Run with streamable-http transport
-    mcp.run(transport="streamable-http", host="0.0.0.0", port=port)
+    workers = int(os.getenv("WORKERS", 1))
+
+    import uvicorn
+
+    # Serve `app` in both modes, so one worker is stateless and gzipped as well.
+    # With WORKERS > 1 each worker process imports this module and serves `app`
+    uvicorn.run(
+        f"{Path(__file__).stem}:app",
+        app_dir=str(Path(__file__).parent),
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+    )
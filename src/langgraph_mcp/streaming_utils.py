@@ -1,7 +1,16 @@
 """Shared streaming utilities for LangGraph chat endpoints"""
 
 from fastapi import Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from langgraph_mcp.compression import (
+    CHAT_STREAM_COMPRESSION,
+    accepts_gzip,
+    gzip_stream,
+)
+from langgraph_mcp.profiling import profile_stream, profiling_requested
+from langgraph_mcp.routing import PROBE_TAG
+from langgraph_mcp.scheduling import SchedulerFull
 from langchain_core.messages import (
     HumanMessage,
     ToolMessage,
@@ -15,7 +24,11 @@ import json
 
 
 async def create_event_stream(
-    langgraph_app, user_input: str, thread_id: str, verbose: bool = False
+    langgraph_app,
+    user_input: str,
+    thread_id: str,
+    verbose: bool = False,
+    speculator=None,
 ):
     """Create an async generator that streams LangGraph events to the frontend"""
     config = {"configurable": {"thread_id": thread_id}}
@@ -25,79 +38,105 @@ async def create_event_stream(
     last_printed_index = -1
     messages_printed = set()
 
-    async for event in langgraph_app.astream_events(
-        {"messages": [HumanMessage(content=user_input)]}, config=config
-    ):
-        event_type = event.get("event")
-
-        if event_type == "on_chat_model_start" and verbose:
-            run_id = event.get("run_id")
-            if run_id and run_id not in messages_printed:
-                messages_printed.add(run_id)
-                data = event.get("data", {})
-                input_data = data.get("input")
-                if isinstance(input_data, list):
-                    messages = input_data
-                elif isinstance(input_data, dict):
-                    messages = input_data.get("messages", [])
-                else:
-                    messages = data.get("messages", [])
-
-                if messages and isinstance(messages, list):
-                    while (
-                        messages
-                        and len(messages) == 1
-                        and isinstance(messages[0], list)
-                    ):
-                        messages = messages[0]
-                    if messages and len(messages) > 0:
-                        _print_message_sequence(messages, skip_final_separator=True)
-                        last_printed_index = len(messages) - 1
-
-        if event_type == "on_chat_model_stream":
-            chunk = event["data"]["chunk"]
-            if hasattr(chunk, "content") and chunk.content:
-                yield chunk.content + " "
-
-        # Tool calls
-        if event_type == "on_tool_start":
-            tool_name = event.get("name", "tool")
-            tool_args = event.get("data", {}).get("input", {})
-            # Use run_id to deduplicate tool calls
-            tool_run_id = event.get("run_id")
-            if tool_run_id and tool_run_id not in tool_calls_shown:
-                tool_calls_shown.add(tool_run_id)
-                yield f"\n__TOOL_CALL__:Calling tool '{tool_name}' with args {tool_args}\n"
-
-        if event_type == "on_tool_end":
-            tool_name = event.get("name", "tool")
-            # LangGraph on_tool_end events have run_id at the top level (unique UUID per tool call)
-            tool_id = event.get("run_id")
-            tool_output = event.get("data", {}).get("output", "")
-
-            if isinstance(tool_output, ToolMessage):
-                tool_output = tool_output.content
-
-            tool_output = _clean_tool_output(str(tool_output))
-
-            if tool_id not in tool_results_shown:
-                yield f"\n__TOOL_CALL_RESULT__:Tool '{tool_name}' returned: {tool_output}\n"
-                tool_results_shown.add(tool_id)
-
-        if event_type == "on_chain_end" and final_message is None:
-            event_name = event.get("name", "")
-            tags = event.get("tags", {})
-            if event_name in ("LangGraph", "") and "node" not in tags:
-                messages = event.get("data", {}).get("output", {}).get("messages", [])
-                if messages:
-                    final_message = _extract_final_message(messages)
-                    if final_message and verbose:
-                        final_index = last_printed_index + 1
-                        content_preview = " ".join(final_message.split())[:50]
-                        print(
-                            f"  [{final_index}] AIMessage: content='{content_preview}...'"
-                        )
-                        print(f"{'='*60}\n")
+    try:
+        async for event in langgraph_app.astream_events(
+            {"messages": [HumanMessage(content=user_input)]}, config=config
+        ):
+            event_type = event.get("event")
+
+            if event_type == "on_chat_model_start" and verbose:
+                run_id = event.get("run_id")
+                if run_id and run_id not in messages_printed:
+                    messages_printed.add(run_id)
+                    data = event.get("data", {})
+                    input_data = data.get("input")
+                    if isinstance(input_data, list):
+                        messages = input_data
+                    elif isinstance(input_data, dict):
+                        messages = input_data.get("messages", [])
+                    else:
+                        messages = data.get("messages", [])
+
+                    if messages and isinstance(messages, list):
+                        while (
+                            messages
+                            and len(messages) == 1
+                            and isinstance(messages[0], list)
+                        ):
+                            messages = messages[0]
+                        if messages and len(messages) > 0:
+                            _print_message_sequence(messages, skip_final_separator=True)
+                            last_printed_index = len(messages) - 1
+
+            if event_type == "on_chat_model_stream":
+                chunk = event["data"]["chunk"]
+                # Start side-effect-free tools as soon as their arguments are complete
+                if speculator and getattr(chunk, "tool_call_chunks", None):
+                    speculator.feed(
+                        thread_id, event.get("run_id"), chunk.tool_call_chunks
+                    )
+                # Text of the routed tool-selection turn is a draft, not the answer
+                if PROBE_TAG in event.get("tags", []):
+                    continue
+                if hasattr(chunk, "content") and chunk.content:
+                    yield chunk.content + " "
+
+            if event_type == "on_chat_model_end" and speculator:
+                speculator.message_done(event.get("run_id"))
+
+            # Tool calls
+            if event_type == "on_tool_start":
+                tool_name = event.get("name", "tool")
+                tool_args = event.get("data", {}).get("input", {})
+                # Use run_id to deduplicate tool calls
+                tool_run_id = event.get("run_id")
+                if tool_run_id and tool_run_id not in tool_calls_shown:
+                    tool_calls_shown.add(tool_run_id)
+                    yield f"\n__TOOL_CALL__:Calling tool '{tool_name}' with args {tool_args}\n"
+
+            # Progress and partial results of long-running MCP tools
+            if event_type == "on_custom_event" and event.get("name") == "tool_progress":
+                progress = event.get("data", {})
+                total = progress.get("total")
+                step = f"{progress.get('progress'):g}/{total:g}" if total else ""
+                message = " ".join(str(progress.get("message") or "").split())
+                yield f"\n__TOOL_PROGRESS__:Tool '{progress.get('tool')}' {step} {message}\n"
+
+            if event_type == "on_tool_end":
+                tool_name = event.get("name", "tool")
+                # LangGraph on_tool_end events have run_id at the top level (unique UUID per tool call)
+                tool_id = event.get("run_id")
+                tool_output = event.get("data", {}).get("output", "")
+
+                if isinstance(tool_output, ToolMessage):
+                    tool_output = tool_output.content
+
+                tool_output = _clean_tool_output(str(tool_output))
+
+                if tool_id not in tool_results_shown:
+                    yield f"\n__TOOL_CALL_RESULT__:Tool '{tool_name}' returned: {tool_output}\n"
+                    tool_results_shown.add(tool_id)
+
+            if event_type == "on_chain_end" and final_message is None:
+                event_name = event.get("name", "")
+                tags = event.get("tags", {})
+                if event_name in ("LangGraph", "") and "node" not in tags:
+                    messages = (
+                        event.get("data", {}).get("output", {}).get("messages", [])
+                    )
+                    if messages:
+                        final_message = _extract_final_message(messages)
+                        if final_message and verbose:
+                            final_index = last_printed_index + 1
+                            content_preview = " ".join(final_message.split())[:50]
+                            print(
+                                f"  [{final_index}] AIMessage: content='{content_preview}...'"
+                            )
+                            print(f"{'='*60}\n")
+    finally:
+        # Results speculated for this run and never claimed are dropped now
+        if speculator:
+            speculator.complete(thread_id)
 
     if final_message:
         yield f"\n__FINAL__:{final_message}"
@@ -112,12 +151,87 @@ async def chat_endpoint_handler(
         thread_id = str(uuid.uuid4())
 
     langgraph_app = request.app.state.langgraph_app
-    return StreamingResponse(
-        create_event_stream(langgraph_app, user_input, thread_id, verbose),
-        media_type="text/plain",
+    thread_runs = getattr(request.app.state, "thread_runs", None)
+
+    if verbose and thread_runs and thread_runs.is_running(thread_id, user_input):
+        print(f"Attaching to in-flight run on thread {thread_id}")
+
+    speculator = getattr(request.app.state, "tool_speculator", None)
+
+    profile = profiling_requested(request)
+
+    def make_stream():
+        event_stream = create_event_stream(
+            langgraph_app, user_input, thread_id, verbose, speculator
+        )
+        # Opt-in per-request profiling (X-Profile: 1 or ?profile=1, CHAT_PROFILING=true)
+        if profile:
+            return profile_stream(event_stream, thread_id)
+        return event_stream
+
+    # Admission control (optional): wait for a fair slot or reject fast
+    scheduler = getattr(request.app.state, "chat_scheduler", None)
+
+    async def admit():
+        ticket = await scheduler.admit(_client_id(request))
+        if verbose and ticket.queue_time > 0.01:
+            print(f"Request queued for {ticket.queue_time * 1000:.0f} ms")
+        return ticket
+
+    try:
+        if thread_runs is not None:
+            # Waits for the thread's turn before taking a slot; the run owns the
+            # slot, and identical in-flight requests attach to the running stream
+            stream = await thread_runs.start(
+                thread_id, user_input, make_stream, admit if scheduler else None
+            )
+            return _streaming_response(request, stream)
+        if scheduler is None:
+            return _streaming_response(request, make_stream())
+        ticket = await admit()
+    except SchedulerFull as e:
+        return PlainTextResponse(
+            str(e),
+            status_code=e.status_code,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    return _streaming_response(
+        request,
+        _release_after(make_stream(), ticket),
+        background=BackgroundTask(ticket.release),
     )
 
 
+def _streaming_response(request: Request, stream, background=None):
+    """StreamingResponse, gzipped per event when enabled and accepted by the client"""
+    if CHAT_STREAM_COMPRESSION and accepts_gzip(request.headers):
+        return StreamingResponse(
+            gzip_stream(stream),
+            media_type="text/plain",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            background=background,
+        )
+    return StreamingResponse(stream, media_type="text/plain", background=background)
+
+
+def _client_id(request: Request) -> str:
+    """Identify the client for fair queueing (X-Client-Id header, else client address)"""
+    client_id = request.headers.get("x-client-id")
+    if client_id:
+        return client_id
+    return request.client.host if request.client else "unknown"
+
+
+async def _release_after(event_stream, ticket):
+    """Stream events and release the scheduler slot when the stream ends"""
+    try:
+        async for chunk in event_stream:
+            yield chunk
+    finally:
+        ticket.release()
+
+
 def _clean_tool_output(tool_output: str) -> str:
     """
     Extract and pretty-print JSON content from Supabase MCP tool output.
@@ -0,0 +1,296 @@
+"""Cached MCP tool catalogs and lazily spawned MCP server sessions"""
+
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import anyio
+from langchain_core.callbacks.manager import adispatch_custom_event
+from langchain_core.runnables import RunnableConfig
+from langchain_core.tools import StructuredTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.tools import _convert_call_tool_result
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+from mcp.types import Tool as MCPTool
+
+DEFAULT_CATALOG_PATH = Path.home() / ".cache" / "langgraph_mcp" / "tool_catalog.json"
+
+
+class ToolCatalog:
+    """
+    Tool schemas per MCP server, persisted to a local JSON file.
+    Entries are keyed by the server command and package version, so a changed
+    command, pinned version or local server file invalidates the entry.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CATALOG_PATH):
+        self.path = Path(path)
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, server_name: str, server_config: dict) -> list[dict] | None:
+        entry = self.entries.get(server_name)
+        if entry and entry["key"] == catalog_key(server_config):
+            return entry["tools"]
+        return None
+
+    def put(self, server_name: str, server_config: dict, tools: list[dict]) -> bool:
+        """Store the tool list, returns True when it differs from the cached one"""
+        changed = self.get(server_name, server_config) != tools
+        if changed:
+            self.entries[server_name] = {
+                "key": catalog_key(server_config),
+                "tools": tools,
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, indent=2), encoding="utf-8")
+        return changed
+
+
+class LazyMCPServer:
+    """
+    One MCP server whose session is opened on first use (or warmed in the background)
+    and then kept open, instead of spawning the server per tool call.
+    When a call fails because the session itself broke (e.g. the server process
+    died), the session is reset and the next call respawns the server.
+    """
+
+    def __init__(self, name: str, config: dict, catalog: ToolCatalog):
+        self.name = name
+        self.config = config
+        self.catalog = catalog
+        self.client = MultiServerMCPClient({name: config})
+        self.task: asyncio.Task | None = None
+        self.ready: asyncio.Future | None = None
+        self.stop = asyncio.Event()
+
+    async def session(self):
+        """The open session, spawning the server on the first call"""
+        if self.ready is None:
+            self.ready = asyncio.get_running_loop().create_future()
+            # The session lives in its own task, because the stdio transport must be
+            # opened and closed by the same task
+            self.task = asyncio.create_task(self._run(self.ready, self.stop))
+        ready = self.ready
+        try:
+            return await asyncio.shield(ready)
+        except Exception:
+            # Allow a retry on the next call
+            if self.ready is ready:
+                self.ready = None
+            raise
+
+    def warm(self):
+        """Start the server in the background"""
+        task = asyncio.create_task(self.session())
+        task.add_done_callback(
+            lambda t: t.cancelled()
+            or t.exception() is None
+            or print(f"Failed to warm {self.name}: {t.exception()}")
+        )
+
+    async def list_tools(self) -> list[dict]:
+        session = await self.session()
+        result = await session.list_tools()
+        return [
+            tool.model_dump(mode="json", exclude_none=True) for tool in result.tools
+        ]
+
+    async def close(self):
+        self.stop.set()
+        if self.task:
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    async def reset(self, session=None):
+        """
+        Stop the server, so the next session() call spawns a new one.
+        When session is given, only reset if it is still the current session
+        (concurrent calls that failed on the same dead session reset it once).
+        """
+        if session is not None and not self._is_current(session):
+            return
+        task, stop = self.task, self.stop
+        self.task, self.ready, self.stop = None, None, asyncio.Event()
+        stop.set()
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _is_current(self, session) -> bool:
+        ready = self.ready
+        return (
+            ready is not None
+            and ready.done()
+            and not ready.cancelled()
+            and ready.exception() is None
+            and ready.result() is session
+        )
+
+    async def _run(self, ready: asyncio.Future, stop: asyncio.Event):
+        try:
+            async with self.client.session(self.name) as session:
+                ready.set_result(session)
+                self._check_catalog(session)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+                # Mark retrieved when nobody waits for it anymore
+                ready.exception()
+            else:
+                print(f"MCP server {self.name} stopped: {e}")
+                if self.ready is ready:
+                    self.ready = None
+
+    def _check_catalog(self, session):
+        """Refresh the catalog in the background when the server's tool list changed"""
+        if self.catalog.get(self.name, self.config) is None:
+            # Catalog miss: load_catalog_tools lists and stores the tools itself
+            return
+
+        async def refresh():
+            result = await session.list_tools()
+            tools = [
+                tool.model_dump(mode="json", exclude_none=True) for tool in result.tools
+            ]
+            if self.catalog.put(self.name, self.config, tools):
+                print(
+                    f"Tool catalog of {self.name} refreshed (restart to use new tools)"
+                )
+
+        task = asyncio.create_task(refresh())
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def to_langchain_tool(self, schema: dict) -> StructuredTool:
+        """LangChain tool built from a catalog schema, calling through the lazy session"""
+        mcp_tool = MCPTool.model_validate(schema)
+
+        async def call_tool(config: RunnableConfig = None, **arguments):
+            session = await self.session()
+
+            # MCP calls the progress callback from the session's receive task, which
+            # has no run context: dispatch with the config of the tool's run instead
+            async def on_progress(progress, total, message):
+                await dispatch_tool_progress(
+                    config, mcp_tool.name, progress, total, message
+                )
+
+            try:
+                result = await session.call_tool(
+                    mcp_tool.name,
+                    arguments,
+                    # No run (e.g. a speculative call) -> nobody to report progress to
+                    progress_callback=on_progress if config is not None else None,
+                )
+            except Exception as e:
+                if is_transport_error(e):
+                    # Dead server process: respawn it on the next call
+                    await self.reset(session)
+                raise
+            return _convert_call_tool_result(result)
+
+        return StructuredTool(
+            name=mcp_tool.name,
+            description=mcp_tool.description or "",
+            args_schema=mcp_tool.inputSchema,
+            coroutine=call_tool,
+            response_format="content_and_artifact",
+            metadata={"mcp_server": self.name},
+        )
+
+
+async def load_catalog_tools(
+    all_servers: dict, catalog_path: Path = None, warm: bool = None
+):
+    """
+    Build LangChain tools for all servers, from the catalog where possible.
+    Catalog hits don't spawn anything (servers start on first call, or in the
+    background when warm=True). Catalog misses are spawned and listed now; servers
+    that fail are skipped. Returns (tools, {server_name: LazyMCPServer}).
+    """
+    catalog = ToolCatalog(
+        catalog_path or os.getenv("MCP_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+    )
+    if warm is None:
+        warm = os.getenv("MCP_WARM_SERVERS", "true").lower() == "true"
+
+    tools, servers = [], {}
+    for server_name, server_config in all_servers.items():
+        server = LazyMCPServer(server_name, server_config, catalog)
+        schemas = catalog.get(server_name, server_config)
+
+        if schemas is not None:
+            print(f"Loaded from catalog: {server_name}")
+            if warm:
+                server.warm()
+        else:
+            try:
+                schemas = await server.list_tools()
+                catalog.put(server_name, server_config, schemas)
+                print(f"Successfully loaded: {server_name}")
+            except Exception as e:
+                print(f"Failed to load {server_name}: {e}")
+                await server.close()
+                continue
+
+        servers[server_name] = server
+        tools.extend(server.to_langchain_tool(schema) for schema in schemas)
+    return tools, servers
+
+
+async def dispatch_tool_progress(
+    config: RunnableConfig, tool_name: str, progress, total, message
+):
+    """Forward an MCP progress notification into the event stream of the tool's run"""
+    await adispatch_custom_event(
+        "tool_progress",
+        {"tool": tool_name, "progress": progress, "total": total, "message": message},
+        config=config,
+    )
+
+
+def is_transport_error(error: BaseException) -> bool:
+    """True when the session broke (server gone, streams closed), not the tool call"""
+    if isinstance(error, McpError):
+        return error.error.code == CONNECTION_CLOSED
+    return isinstance(
+        error,
+        (
+            anyio.ClosedResourceError,
+            anyio.BrokenResourceError,
+            anyio.EndOfStream,
+            OSError,
+        ),
+    )
+
+
+def catalog_key(server_config: dict) -> str:
+    """Hash of the server command and package version"""
+    args = [str(arg) for arg in server_config.get("args", [])]
+    key = {
+        "command": server_config.get("command"),
+        "args": args,
+        "version": _package_version(args),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _package_version(args: list[str]) -> str:
+    """
+    Version of the server package: the content hash of a local server file,
+    the pinned version of a package (e.g. firecrawl-mcp@1.2.3), else "latest"
+    """
+    for arg in args:
+        path = Path(arg)
+        if path.suffix == ".py" and path.is_file():
+            return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+    for arg in args:
+        if arg.startswith("-"):
+            continue
+        name, _, version = arg.rpartition("@")
+        return version if name and version else "latest"
+    return "latest"
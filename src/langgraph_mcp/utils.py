@@ -0,0 +1,17 @@
+"""Small helpers shared by the agent modules"""
+
+import math
+from collections.abc import Iterable
+
+# Config for model calls whose tokens must not stream into the chat
+# (background summaries, hedged requests)
+SILENT = {"callbacks": []}
+
+
+def percentile_ms(values: Iterable[float], pct: float) -> float | None:
+    """pct-th percentile (nearest rank, 0-100) of durations in seconds, in milliseconds"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = max(math.ceil(len(ordered) * pct / 100) - 1, 0)
+    return round(ordered[index] * 1000, 1)
@@ -0,0 +1,75 @@
+"""Offline, cached graph visualisation (kept off the graph build path)"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+OUTPUT_DIR = Path(__file__).parent / "graph_visualisation"
+
+
+def graph_topology_hash(compiled_graph) -> str:
+    """Hash the nodes and edges of a compiled graph (stable across runs)"""
+    graph = compiled_graph.get_graph()
+    nodes = sorted(graph.nodes)
+    edges = sorted(
+        (edge.source, edge.target, str(edge.data), edge.conditional)
+        for edge in graph.edges
+    )
+    return hashlib.sha256(repr((nodes, edges)).encode()).hexdigest()[:12]
+
+
+def render_graph(
+    compiled_graph, fmt: str = "mermaid", name: str = "model_graph"
+) -> Path:
+    """
+    Render the graph locally, without network calls, and cache it by topology hash.
+    fmt: "mermaid" (Mermaid text, no extra dependencies) or "png" (needs the local
+    mermaid-cli `mmdc` on PATH, e.g. `npm install -g @mermaid-js/mermaid-cli`)
+    Returns the path of the (cached) file.
+    """
+    extension = "mmd" if fmt == "mermaid" else "png"
+    path = OUTPUT_DIR / f"{name}-{graph_topology_hash(compiled_graph)}.{extension}"
+
+    # Same topology -> already rendered
+    if path.exists():
+        return path
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    graph = compiled_graph.get_graph()
+    if fmt == "mermaid":
+        path.write_text(graph.draw_mermaid(), encoding="utf-8")
+    elif fmt == "png":
+        # mermaid-cli bundles mermaid and its browser, so nothing is fetched at render time
+        mmdc = shutil.which("mmdc")
+        if mmdc is None:
+            raise RuntimeError("png rendering needs the mermaid-cli `mmdc` on PATH")
+        source = path.with_suffix(".mmd")
+        source.write_text(graph.draw_mermaid(), encoding="utf-8")
+        subprocess.run(
+            [mmdc, "-i", str(source), "-o", str(path)],
+            check=True,
+            capture_output=True,
+        )
+    else:
+        raise ValueError(f"Unknown graph visualisation format: {fmt}")
+    return path
+
+
+def maybe_render_graph(compiled_graph, name: str = "model_graph") -> Path | None:
+    """
+    Opt-in rendering: only renders when GRAPH_VISUALISATION is set to "mermaid" or "png".
+    Rendering errors are reported but never break the agent.
+    """
+    fmt = os.getenv("GRAPH_VISUALISATION", "").strip().lower()
+    if not fmt:
+        return None
+
+    try:
+        path = render_graph(compiled_graph, fmt=fmt, name=name)
+        print(f"Graph visualisation: {path}")
+        return path
+    except Exception as e:
+        print(f"Failed to render graph visualisation: {e}")
+        return None
@@ -119,9 +119,10 @@ function sendMessage(text, showUserBubble = true) {
                 let buffer = ''; // Buffer for incomplete chunks
                 let finalMessageProcessed = false; // Track if final message was already processed
                 let processingIndicator = null; // Reference to loading indicator div
+                let progressDiv = null; // Partial results of the running tool
                 
                 function extractMarker(marker) {
-                    const pattern = new RegExp(marker + ':(.+?)(?=\\n__TOOL_CALL__:|\\n__TOOL_CALL_RESULT__:|\\n__FINAL__:|$)', 's');
+                    const pattern = new RegExp(marker + ':(.+?)(?=\\n__TOOL_CALL__:|\\n__TOOL_CALL_RESULT__:|\\n__TOOL_PROGRESS__:|\\n__FINAL__:|$)', 's');
                     const match = buffer.match(pattern) || buffer.match(new RegExp(marker + ':(.+)$', 's'));
                     if (match) {
                         const content = match[1].trim();
@@ -163,7 +164,7 @@ function sendMessage(text, showUserBubble = true) {
                 }
                 
                 function processBuffer() {
-                    const markers = ['__TOOL_CALL__', '__TOOL_CALL_RESULT__', '__FINAL__'];
+                    const markers = ['__TOOL_CALL__', '__TOOL_CALL_RESULT__', '__TOOL_PROGRESS__', '__FINAL__'];
                     const firstMarker = markers.find(m => buffer.includes(m + ':'));
                     
                     if (!firstMarker && !toolsUsed && buffer.trim()) {
@@ -203,9 +204,31 @@ function sendMessage(text, showUserBubble = true) {
                             }
                         }
                         
+                        if (buffer.includes('__TOOL_PROGRESS__:')) {
+                            const msg = extractMarker('__TOOL_PROGRESS__');
+                            if (msg) {
+                                if (!progressDiv) {
+                                    progressDiv = document.createElement('div');
+                                    progressDiv.className = 'message tool';
+                                    progressDiv.innerHTML = '<b>Tool Progress:</b>';
+                                    chatWindow.appendChild(progressDiv);
+                                }
+                                const line = document.createElement('div');
+                                line.textContent = msg;
+                                progressDiv.appendChild(line);
+                                showProcessingIndicator();
+                                processed = true;
+                            }
+                        }
+                        
                         if (buffer.includes('__TOOL_CALL_RESULT__:')) {
                             const msg = extractMarker('__TOOL_CALL_RESULT__');
                             if (msg) {
+                                // The full result replaces the partial results
+                                if (progressDiv) {
+                                    progressDiv.remove();
+                                    progressDiv = null;
+                                }
                                 const toolDiv = document.createElement('div');
                                 toolDiv.className = 'message tool';
                                 if (msg.length > 500) {
@@ -0,0 +1,82 @@
+"""
+Line index cache of the code-explorer server
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(
+    0,
+    str(
+        Path(__file__).parent.parent
+        / "src"
+        / "langgraph_mcp"
+        / "streamable_http_mcp_server"
+    ),
+)
+
+import line_index  # noqa: E402
+from line_index import LineIndexCache  # noqa: E402
+
+
+class LineIndexCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+
+    def write(self, name: str, text: str) -> Path:
+        path = self.root / name
+        path.write_text(text)
+        return path
+
+    def test_file_count_is_capped(self):
+        cache = LineIndexCache(max_files=2)
+        paths = [self.write(f"{i}.py", "a\nb\n") for i in range(3)]
+        for path in paths:
+            cache.get(path)
+
+        self.assertEqual(list(cache.indexes), [p.resolve() for p in paths[1:]])
+        self.assertEqual(cache.memory, sum(i.memory for i in cache.indexes.values()))
+
+    def test_changed_file_is_reindexed(self):
+        cache = LineIndexCache()
+        path = self.write("a.py", "one\n")
+        self.assertEqual(cache.get(path).line_count, 1)
+
+        path.write_text("one\ntwo\nthree\n")
+        self.assertEqual(cache.get(path).line_count, 3)
+        self.assertEqual(len(cache.indexes), 1)
+
+    def test_index_is_built_outside_the_lock(self):
+        cache = LineIndexCache()
+        slow, fast = self.write("slow.py", "a\n"), self.write("fast.py", "b\n")
+        building, release = threading.Event(), threading.Event()
+        real_index = line_index.LineIndex
+
+        def blocking_index(path):
+            if path.name == "slow.py":
+                building.set()
+                release.wait(5)
+            return real_index(path)
+
+        with mock.patch.object(line_index, "LineIndex", blocking_index):
+            worker = threading.Thread(target=cache.get, args=(slow,))
+            worker.start()
+            self.assertTrue(building.wait(5))
+            # Another file is served while the slow one is still being indexed
+            self.assertEqual(cache.get(fast).read_lines(1, 1), b"b\n")
+            release.set()
+            worker.join(5)
+
+        self.assertEqual(set(cache.indexes), {slow.resolve(), fast.resolve()})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+The math server's results survive a real stdio session (output schema validation)
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+from langchain_mcp_adapters.client import MultiServerMCPClient
+
+MATH_SERVER = (
+    Path(__file__).parent.parent
+    / "src"
+    / "langgraph_mcp"
+    / "local_mcp_servers"
+    / "math_server.py"
+)
+
+CLIENT = MultiServerMCPClient(
+    {
+        "math": {
+            "command": sys.executable,
+            "args": [str(MATH_SERVER)],
+            "transport": "stdio",
+        }
+    }
+)
+
+
+class MathServerTest(unittest.IsolatedAsyncioTestCase):
+    async def call(self, name: str, arguments: dict):
+        # The stdio session must be opened and closed by the same task
+        async with CLIENT.session("math") as session:
+            return await session.call_tool(name, arguments)
+
+    async def result(self, name: str, arguments: dict):
+        result = await self.call(name, arguments)
+        self.assertFalse(result.isError, result.content)
+        return result.structuredContent["result"]
+
+    async def test_evaluate_keeps_large_integers_exact(self):
+        self.assertEqual(
+            await self.result("evaluate", {"expression": "9**999"}), 9**999
+        )
+        self.assertEqual(
+            await self.result("evaluate", {"expression": "2**53 + 1"}), 2**53 + 1
+        )
+
+    async def test_evaluate_float(self):
+        self.assertEqual(
+            await self.result("evaluate", {"expression": "(3 + 5) / 2"}), 4.0
+        )
+
+    async def test_evaluate_rejects_too_large_results(self):
+        result = await self.call("evaluate", {"expression": "9**9**9"})
+        self.assertTrue(result.isError)
+
+    async def test_batch_tools_accept_empty_lists(self):
+        for name in ("batch_add", "batch_multiply", "batch_divide"):
+            self.assertEqual(await self.result(name, {"pairs": []}), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Circuit breaker of the MCP health monitor
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+
+from langgraph_mcp.mcp_health import CLOSED, OPEN, MCPHealthMonitor
+
+
+class SlowSession:
+    async def send_ping(self):
+        await asyncio.sleep(10)
+
+
+class RunningServer:
+    """Stands in for a spawned MCPServer whose pings time out"""
+
+    def __init__(self):
+        self.ready = asyncio.get_running_loop().create_future()
+        self.ready.set_result(SlowSession())
+        self.resets = 0
+
+    async def session(self):
+        return self.ready.result()
+
+    async def reset(self, session=None):
+        self.resets += 1
+
+
+class PingTest(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_pings_count_toward_the_threshold(self):
+        server = RunningServer()
+        monitor = MCPHealthMonitor(
+            {"weather": server}, ping_timeout=0.01, failure_threshold=3
+        )
+        health = monitor.health["weather"]
+
+        for _ in range(2):
+            await monitor._ping("weather", server)
+        self.assertEqual(health.state, CLOSED)
+        self.assertEqual(server.resets, 0)
+
+        await monitor._ping("weather", server)
+        self.assertEqual(health.state, OPEN)
+        self.assertEqual(server.resets, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
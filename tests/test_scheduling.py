@@ -0,0 +1,108 @@
+"""
+Per-thread serialization, admission and shared runs of chat requests
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import asyncio
+import unittest
+
+from langgraph_mcp.scheduling import ChatScheduler, SchedulerFull, ThreadRuns
+
+
+def gated_stream(gate: asyncio.Event, chunks: list[str], started: list = None):
+    async def stream():
+        if started is not None:
+            started.append(chunks[0])
+        await gate.wait()
+        for chunk in chunks:
+            yield chunk
+
+    return stream
+
+
+async def collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+class ThreadRunsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_runs_waiting_for_their_thread_hold_no_slot(self):
+        scheduler = ChatScheduler(max_concurrency=2)
+        runs = ThreadRuns()
+        gate = asyncio.Event()
+        started = []
+
+        def admit():
+            return scheduler.admit("client")
+
+        # Three runs on one thread, then one run on another thread
+        pending = [
+            asyncio.create_task(
+                runs.start("a", f"q{i}", gated_stream(gate, [f"a{i}"], started), admit)
+            )
+            for i in range(3)
+        ]
+        other = await runs.start("b", "q", gated_stream(gate, ["b"], started), admit)
+        await asyncio.sleep(0.01)
+
+        # Only the first run of thread a holds a slot, thread b got the second one
+        self.assertEqual(sorted(started), ["a0", "b"])
+        self.assertEqual(scheduler.active, 2)
+
+        gate.set()
+        self.assertEqual(await collect(other), ["b"])
+        streams = [await task for task in pending]
+        self.assertEqual([await collect(s) for s in streams], [["a0"], ["a1"], ["a2"]])
+        self.assertEqual(scheduler.active, 0)
+        self.assertEqual(runs.locks, {})
+
+    async def test_rejected_admission_frees_the_thread(self):
+        scheduler = ChatScheduler(max_concurrency=0, max_queue=0)
+        runs = ThreadRuns()
+
+        with self.assertRaises(SchedulerFull):
+            await runs.start(
+                "a",
+                "q",
+                gated_stream(asyncio.Event(), ["x"]),
+                lambda: scheduler.admit("client"),
+            )
+        self.assertEqual((runs.in_flight, runs.locks), ({}, {}))
+
+    async def test_attached_request_keeps_the_slot_owned_by_the_run(self):
+        scheduler = ChatScheduler(max_concurrency=1)
+        runs = ThreadRuns()
+        gate = asyncio.Event()
+
+        def admit():
+            return scheduler.admit("client")
+
+        first = await runs.start("a", "q", gated_stream(gate, ["x", "y"]), admit)
+        attached = await runs.start("a", "q", None, admit)
+        reader = asyncio.create_task(collect(attached))
+        await asyncio.sleep(0.01)
+
+        # The original request disconnects, the run goes on for the attached one
+        await first.aclose()
+        self.assertEqual(scheduler.active, 1)
+
+        gate.set()
+        self.assertEqual(await reader, ["x", "y"])
+        self.assertEqual(scheduler.active, 0)
+
+    async def test_run_errors_reach_every_subscriber(self):
+        async def failing():
+            yield "x"
+            raise RuntimeError("boom")
+
+        runs = ThreadRuns()
+        first = await runs.start("a", "q", failing)
+        attached = await runs.start("a", "q", None)
+
+        for stream in (first, attached):
+            with self.assertRaises(RuntimeError):
+                await collect(stream)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tool catalog of a real stdio MCP server
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from langgraph_mcp.tool_catalog import load_catalog_tools
+
+WEATHER_SERVER = (
+    Path(__file__).parent.parent
+    / "src"
+    / "langgraph_mcp"
+    / "local_mcp_servers"
+    / "weather_server.py"
+)
+SERVERS = {
+    "weather": {
+        "command": sys.executable,
+        "args": [str(WEATHER_SERVER)],
+        "transport": "stdio",
+    }
+}
+
+
+class ToolCatalogTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        catalog_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(catalog_dir.cleanup)
+        self.catalog_path = Path(catalog_dir.name) / "catalog.json"
+
+    async def load(self) -> tuple[list, str]:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tools, servers = await load_catalog_tools(
+                SERVERS, catalog_path=self.catalog_path, warm=True
+            )
+            # Let the session's background catalog check finish
+            await servers["weather"].session()
+            await asyncio.sleep(0.5)
+            for server in servers.values():
+                await server.close()
+        return tools, output.getvalue()
+
+    async def test_cold_start_does_not_report_a_refresh(self):
+        tools, output = await self.load()
+        self.assertIn("Successfully loaded: weather", output)
+        self.assertNotIn("refreshed", output)
+
+        cached_tools, output = await self.load()
+        self.assertIn("Loaded from catalog: weather", output)
+        self.assertNotIn("refreshed", output)
+        self.assertEqual(
+            [tool.name for tool in cached_tools], [tool.name for tool in tools]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Progress notifications of a real stdio MCP server reach the graph's event stream
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode
+
+from langgraph_mcp.mcp_health import MCPHealthMonitor
+from langgraph_mcp.speculation import SpeculativeToolExecutor
+from langgraph_mcp.tool_catalog import load_catalog_tools
+
+WEATHER_SERVER = (
+    Path(__file__).parent.parent
+    / "src"
+    / "langgraph_mcp"
+    / "local_mcp_servers"
+    / "weather_server.py"
+)
+
+
+class ToolProgressTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.catalog_dir = tempfile.TemporaryDirectory()
+        servers = {
+            "weather": {
+                "command": sys.executable,
+                "args": [str(WEATHER_SERVER)],
+                "transport": "stdio",
+            }
+        }
+        self.tools, self.servers = await load_catalog_tools(
+            servers,
+            catalog_path=Path(self.catalog_dir.name) / "catalog.json",
+            warm=False,
+        )
+
+    async def asyncTearDown(self):
+        for server in self.servers.values():
+            await server.close()
+        self.catalog_dir.cleanup()
+
+    async def progress_events(self, tools) -> list[dict]:
+        call = {
+            "name": "get_weather_batch",
+            "args": {"cities": ["london", "paris", "london"]},
+            "id": "call-1",
+        }
+        # Like the agents: the tools node runs inside a graph
+        builder = StateGraph(MessagesState)
+        builder.add_node("tools", ToolNode(tools))
+        builder.add_edge(START, "tools")
+        builder.add_edge("tools", END)
+
+        events = []
+        async for event in builder.compile().astream_events(
+            {"messages": [AIMessage(content="", tool_calls=[call])]}, version="v2"
+        ):
+            if event["event"] == "on_custom_event" and event["name"] == "tool_progress":
+                events.append(event["data"])
+        return events
+
+    async def test_progress_is_dispatched(self):
+        events = await self.progress_events(self.tools)
+
+        self.assertEqual([event["progress"] for event in events], [1, 2])
+        self.assertTrue(all(event["tool"] == "get_weather_batch" for event in events))
+        self.assertTrue(all(event["total"] == 2 for event in events))
+
+    async def test_progress_through_health_and_speculation_wrappers(self):
+        MCPHealthMonitor(self.servers).wrap_tools(self.tools)
+        SpeculativeToolExecutor(self.tools, patterns=["get_weather*"])
+
+        events = await self.progress_events(self.tools)
+
+        self.assertEqual(len(events), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Coalescing and cancellation of upstream weather lookups
+
+Run: poetry run python -m unittest discover tests
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).parent.parent / "src" / "langgraph_mcp" / "local_mcp_servers")
+)
+
+from weather_upstream import UpstreamWeather  # noqa: E402
+
+
+class SlowSource:
+    def __init__(self):
+        self.calls = 0
+
+    async def current(self, city: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return f"Sunny in {city}"
+
+
+class UpstreamWeatherTest(unittest.IsolatedAsyncioTestCase):
+    async def test_identical_lookups_share_one_fetch(self):
+        source = SlowSource()
+        upstream = UpstreamWeather(source)
+
+        results = await asyncio.gather(*(upstream.current("rome") for _ in range(3)))
+
+        self.assertEqual(results, ["Sunny in rome"] * 3)
+        self.assertEqual(source.calls, 1)
+
+    async def test_caller_after_last_waiter_cancelled_gets_a_result(self):
+        source = SlowSource()
+        upstream = UpstreamWeather(source)
+
+        first = asyncio.create_task(upstream.current("rome"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0)
+
+        # Arrives while the orphaned fetch is still unwinding
+        self.assertEqual(await upstream.current("rome"), "Sunny in rome")
+        self.assertEqual(upstream.in_flight, {})
+
+
+if __name__ == "__main__":
+    unittest.main()